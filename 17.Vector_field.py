@@ -1,6 +1,15 @@
 from raylib import *
 from pyray import *
+import argparse
+import hashlib
 import math
+import multiprocessing
+import os
+import random
+import threading
+import time as clock
+import numpy as np
+from multiprocessing import shared_memory
 
 # --- CONSTANTS ---
 SCREEN_WIDTH = 1000
@@ -12,13 +21,38 @@ GRID_SIZE = 25          # Spacing between drawn vector arrows
 PARTICLE_COUNT = 2500   # Number of particles following the field
 FIELD_STRENGTH = 1.5    # How quickly particles accelerate towards the field vector
 PARTICLE_DECAY = 0.99   # Damping factor for particle speed (friction)
-TRAIL_LENGTH = 0.9      # 1.0 = no trail, 0.9 = long trail fade
+PARTICLE_MAX_SPEED = 5.0 # Speed limit in pixels per step, for stability
+PARTICLE_BACKEND = "numpy" # "object", "numpy", "grid", "parallel" or "parallel-grid" (see PARTICLE_BACKENDS)
+PARALLEL_WORKERS = os.cpu_count() or 1 # Worker processes for the parallel backends
+PARALLEL_STEP_TIMEOUT = 5.0 # Seconds update() waits for the workers before giving up on them
+PARALLEL_STOP_TIMEOUT = 10.0 # Seconds close() waits for the workers before terminating them
+TRAIL_HALF_LIFE = 0.11  # Seconds for a particle trail to fade to half brightness
+TRAIL_MIN_FADE_ALPHA = 16 # Smallest fade drawn into the trail buffer (8-bit alpha)
+FIELD_REBUILD_INTERVAL = 0.25 # Seconds of field time per cached layer rebuild (0 = every frame)
+
+# Flow Visualization Constants (Streamline and LIC views)
+FIELD_SAMPLE_SPACING = 10     # Pixel spacing of the lattice the field is sampled on
+STREAMLINE_SEED_SPACING = 30  # Pixel spacing of the evenly spaced streamline seeds
+STREAMLINE_STEPS = 30         # RK4 steps traced in each direction from a seed
+STREAMLINE_STEP_SIZE = 3.0    # Pixels advanced per RK4 step
+LIC_SCALE = 2                 # LIC texture resolution is the screen size divided by this
+LIC_KERNEL_STEPS = 10         # Noise samples taken in each direction along the flow
+LIC_ROWS_PER_FRAME = 10       # LIC texture rows computed per frame while rebuilding
+LIC_REBUILD_INTERVAL = 2.0    # Seconds of field time per LIC rebuild; one takes ~35 frames
+LIC_NOISE_SEED = 1234
+
+# View Modes
+VIEW_PARTICLES = 0
+VIEW_STREAMLINES = 1
+VIEW_LIC = 2
+VIEW_NAMES = ["Particles", "Streamlines", "Line Integral Convolution"]
 
 # Colors
 BACKGROUND_COLOR = Color(20, 20, 30, 255)
 PARTICLE_COLOR = Color(100, 255, 255, 255) # Cyan/Light Blue
 # UPDATED: Fully opaque and brighter light blue-gray for maximum visibility
 FIELD_COLOR = Color(150, 150, 200, 255) 
+STREAMLINE_COLOR = Color(100, 255, 255, 200)
 
 # --- Particle Class ---
 class Particle:
@@ -43,7 +77,7 @@ class Particle:
         self.velocity = Vector2Scale(self.velocity, PARTICLE_DECAY)
         
         # 3. Limit maximum speed for stability
-        max_speed = 5.0 
+        max_speed = PARTICLE_MAX_SPEED
         if Vector2LengthSqr(self.velocity) > max_speed * max_speed:
             self.velocity = Vector2Scale(Vector2Normalize(self.velocity), max_speed)
         
@@ -61,9 +95,10 @@ class Particle:
 
 # --- Field Logic ---
 
-def get_field_vector(x, y, time):
+def get_field_vector(x, y, time, mouse=None):
     """
     Calculates the vector at position (x, y) based on a simple, dynamic function.
+    `mouse` is the repeller position while the left button is held, otherwise None.
     """
     # Normalize coordinates to a smaller range
     scaled_x = x / 100.0
@@ -78,9 +113,8 @@ def get_field_vector(x, y, time):
     vy = math.sin(angle)
     
     # --- Mouse Interaction (Repeller) ---
-    mouse_pos = GetMousePosition()
-    if IsMouseButtonDown(MOUSE_BUTTON_LEFT):
-        mouse_force = Vector2Subtract(mouse_pos, Vector2(x, y))
+    if mouse is not None:
+        mouse_force = Vector2Subtract(mouse, Vector2(x, y))
         dist_sq = Vector2LengthSqr(mouse_force)
         
         if dist_sq < 200 * 200: # Check interaction radius
@@ -96,6 +130,650 @@ def get_field_vector(x, y, time):
     return Vector2(vx, vy)
 
 
+def get_field_vectors(x, y, time, mouse=None):
+    """
+    NumPy version of get_field_vector: evaluates the field for whole arrays of
+    coordinates at once and returns the (vx, vy) component arrays.
+    """
+    scaled_x = x / 100.0
+    scaled_y = y / 100.0
+    
+    angle_offset = np.arctan2(scaled_y - (SCREEN_HEIGHT/200.0), scaled_x - (SCREEN_WIDTH/200.0))
+    angle = scaled_x * 0.5 + scaled_y * 0.3 + time * 0.2 + angle_offset * 0.1
+    
+    vx = np.cos(angle)
+    vy = np.sin(angle)
+    
+    if mouse is not None:
+        dx = mouse.x - x
+        dy = mouse.y - y
+        dist_sq = dx * dx + dy * dy
+        dist = np.sqrt(dist_sq)
+        
+        # Same repeller as get_field_vector: normalized direction * -1000 / max(dist_sq, 100)
+        scale = np.where((dist_sq < 200 * 200) & (dist > 0), -1000.0 / np.maximum(dist_sq, 100) / np.maximum(dist, 1e-9), 0.0)
+        vx = vx + dx * scale
+        vy = vy + dy * scale
+        
+    return vx, vy
+
+
+def get_field_key(time, mouse, interval):
+    """
+    Identifies the field state shown by the cached layers: time snapped to the start of
+    its `interval` bucket plus the repeller position. Equal keys mean equal pictures.
+    """
+    if interval > 0:
+        time = math.floor(time / interval) * interval
+    return (time, None if mouse is None else (mouse.x, mouse.y))
+
+
+class SampledField:
+    """
+    The field evaluated once on a regular lattice for a fixed (time, mouse) state and
+    read back anywhere by bilinear interpolation. Instances are never modified, so
+    work spread over several frames can keep using the one it started with.
+    
+    Vectors are stored as complex numbers (vx + i*vy): one gather and one blend then
+    interpolate both components together, which roughly halves the NumPy work.
+    """
+    def __init__(self, width, height, spacing, time, mouse):
+        self.spacing = spacing
+        self.cols = int(math.ceil(width / spacing)) + 1
+        self.rows = int(math.ceil(height / spacing)) + 1
+        
+        grid_x, grid_y = np.meshgrid(np.arange(self.cols) * float(spacing), np.arange(self.rows) * float(spacing))
+        vx, vy = get_field_vectors(grid_x, grid_y, time, mouse)
+        self.vectors = (vx + 1j * vy).ravel()
+
+    def sample(self, z):
+        """Bilinearly interpolates the lattice at an array of points z = x + i*y (clamped to the lattice)."""
+        gx = np.clip(z.real / self.spacing, 0.0, self.cols - 1.001)
+        gy = np.clip(z.imag / self.spacing, 0.0, self.rows - 1.001)
+        i = gx.astype(np.intp)
+        j = gy.astype(np.intp)
+        fx = gx - i
+        fy = gy - j
+        
+        v = self.vectors
+        k = j * self.cols + i
+        top = v[k] + (v[k + 1] - v[k]) * fx
+        bottom = v[k + self.cols] + (v[k + self.cols + 1] - v[k + self.cols]) * fx
+        return top + (bottom - top) * fy
+
+    def sample_direction(self, z):
+        """Like sample, but scaled to unit length so integration advances by arc length."""
+        v = self.sample(z)
+        return v / np.maximum(np.abs(v), 1e-12)
+
+
+def draw_field_arrows(time, mouse):
+    """Draws one arrow per grid point showing the field direction."""
+    for i in range(0, SCREEN_WIDTH, GRID_SIZE):
+        for j in range(0, SCREEN_HEIGHT, GRID_SIZE):
+            
+            start = Vector2(i, j)
+            field_vec = get_field_vector(i, j, time, mouse)
+            
+            # Normalize and scale vector for drawing length
+            field_len = Vector2Length(field_vec)
+            if field_len > 0:
+                field_vec = Vector2Scale(field_vec, GRID_SIZE * 0.3 / field_len) 
+            
+            end = Vector2Add(start, field_vec)
+            
+            DrawLineV(start, end, FIELD_COLOR)
+            DrawCircleV(end, 2, FIELD_COLOR) # Simple dot/arrow head
+
+
+# --- Particle Backends ---
+# Every backend advances the same particle model one step per frame and exposes
+# update(time, mouse), positions(), draw() and close(), so they are interchangeable
+# in main() and in the headless benchmark.
+
+def advect_particles(x, y, vx, vy, fx, fy):
+    """
+    Advances float32 particle arrays one step in place, following Particle.update in
+    the same order so results track the object backend (raymath works in float32 too).
+    """
+    # 1-2. Field force, then damping
+    vx += fx.astype(np.float32) * np.float32(FIELD_STRENGTH)
+    vy += fy.astype(np.float32) * np.float32(FIELD_STRENGTH)
+    vx *= np.float32(PARTICLE_DECAY)
+    vy *= np.float32(PARTICLE_DECAY)
+    
+    # 3. Speed limit: normalize then scale, as Vector2Normalize/Vector2Scale do
+    too_fast = vx * vx + vy * vy > np.float32(PARTICLE_MAX_SPEED * PARTICLE_MAX_SPEED)
+    if too_fast.any():
+        inv_length = np.float32(1.0) / np.sqrt(vx[too_fast] * vx[too_fast] + vy[too_fast] * vy[too_fast])
+        vx[too_fast] = vx[too_fast] * inv_length * np.float32(PARTICLE_MAX_SPEED)
+        vy[too_fast] = vy[too_fast] * inv_length * np.float32(PARTICLE_MAX_SPEED)
+    
+    # 4. Move
+    x += vx
+    y += vy
+    
+    # 5. Wrap around (same checks, same order as Particle.update)
+    x[x < 0] = SCREEN_WIDTH
+    x[x > SCREEN_WIDTH] = 0
+    y[y < 0] = SCREEN_HEIGHT
+    y[y > SCREEN_HEIGHT] = 0
+
+
+class ParticleField:
+    """
+    The field as the array backends see it: evaluated exactly at every particle, or with
+    `sampled=True` read from a SampledField rebuilt once per field key.
+    """
+    def __init__(self, sampled):
+        self.sampled = sampled
+        self.field = None
+        self.field_key = None
+
+    def evaluate(self, x, y, time, mouse):
+        if not self.sampled:
+            return get_field_vectors(x.astype(np.float64), y.astype(np.float64), time, mouse)
+        
+        field_key = get_field_key(time, mouse, FIELD_REBUILD_INTERVAL)
+        if field_key != self.field_key:
+            self.field = SampledField(SCREEN_WIDTH, SCREEN_HEIGHT, FIELD_SAMPLE_SPACING, field_key[0], mouse)
+            self.field_key = field_key
+        v = self.field.sample(x.astype(np.float64) + 1j * y)
+        return v.real, v.imag
+
+
+class ObjectParticles:
+    """One Particle object per particle, advanced with raymath calls (the original model)."""
+    def __init__(self, xs, ys):
+        self.particles = [Particle(x, y) for x, y in zip(xs, ys)]
+
+    def update(self, time, mouse):
+        for p in self.particles:
+            field_vec = get_field_vector(p.position.x, p.position.y, time, mouse)
+            p.update(field_vec, None) # The particle model steps once per frame; dt is unused
+
+    def positions(self):
+        return np.array([(p.position.x, p.position.y) for p in self.particles], dtype=np.float32)
+
+    def draw(self):
+        for p in self.particles:
+            p.draw()
+
+    def close(self):
+        pass
+
+
+class ArrayParticles:
+    """
+    Structure-of-arrays backend: all particles advance with a few NumPy expressions per
+    step, bit-identical to the object backend when the field is evaluated exactly.
+    With `sampled=True` the field comes from a SampledField instead (the "grid" backend).
+    """
+    def __init__(self, xs, ys, sampled=False):
+        self.x = np.array(xs, dtype=np.float32)
+        self.y = np.array(ys, dtype=np.float32)
+        self.vx = np.zeros_like(self.x)
+        self.vy = np.zeros_like(self.y)
+        self.field = ParticleField(sampled)
+
+    def update(self, time, mouse):
+        fx, fy = self.field.evaluate(self.x, self.y, time, mouse)
+        advect_particles(self.x, self.y, self.vx, self.vy, fx, fy)
+
+    def positions(self):
+        return np.stack([self.x, self.y], axis=1)
+
+    def draw(self):
+        for x, y in zip(self.x.tolist(), self.y.tolist()):
+            DrawPixelV((x, y), PARTICLE_COLOR)
+
+    def close(self):
+        pass
+
+
+# Layout of the shared control block the main process publishes each step
+CONTROL_TIME = 0
+CONTROL_HAS_MOUSE = 1
+CONTROL_MOUSE_X = 2
+CONTROL_MOUSE_Y = 3
+CONTROL_STOP = 4
+CONTROL_SIZE = 5
+
+
+def advect_shard(shm_name, count, start, end, sampled, control, barrier):
+    """
+    Worker process loop for ParallelParticles: maps the shared particle arrays and
+    reports ready at the barrier, then for every step waits for the start barrier, advances particles [start, end) in place
+    against the published field snapshot and waits at the done barrier.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    state = np.ndarray((4, count), dtype=np.float32, buffer=shm.buf)
+    x, y, vx, vy = (row[start:end] for row in state)
+    field = ParticleField(sampled)
+    
+    try:
+        barrier.wait() # Ready
+        while True:
+            barrier.wait()
+            if control[CONTROL_STOP]:
+                break
+            
+            mouse = Vector2(control[CONTROL_MOUSE_X], control[CONTROL_MOUSE_Y]) if control[CONTROL_HAS_MOUSE] else None
+            fx, fy = field.evaluate(x, y, control[CONTROL_TIME], mouse)
+            advect_particles(x, y, vx, vy, fx, fy)
+            
+            barrier.wait()
+    except threading.BrokenBarrierError:
+        pass # close() aborted the barrier
+    finally:
+        # Views into the block must be released before it can be closed
+        del x, y, vx, vy, state
+        shm.close()
+
+
+class ParallelParticles(ArrayParticles):
+    """
+    ArrayParticles sharded across worker processes. The particle arrays live in one
+    multiprocessing.shared_memory block that every process maps, and each worker
+    advances its own contiguous slice in place.
+    
+    Each step crosses a barrier twice: once to release the workers on the field
+    snapshot (time, mouse) published in a shared control block, and once when every
+    slice is done. Nothing writes to the arrays between the second barrier and the next
+    update, so positions() and draw() read the shared arrays directly, without copying.
+    Only update() waits with a timeout: workers simply wait while the demo shows
+    another view and no updates come, but a worker that dies mid-step fails the update
+    instead of freezing the window.
+    
+    Workers are started with the "spawn" method, so they are fresh interpreters that
+    inherit neither the window's GL context nor the main process's threads.
+    """
+    def __init__(self, xs, ys, sampled=False, workers=None):
+        count = len(xs)
+        workers = max(1, min(workers or PARALLEL_WORKERS, count))
+        
+        self.shm = shared_memory.SharedMemory(create=True, size=4 * count * np.dtype(np.float32).itemsize)
+        state = np.ndarray((4, count), dtype=np.float32, buffer=self.shm.buf)
+        state[0] = xs
+        state[1] = ys
+        state[2:] = 0.0
+        self.x, self.y, self.vx, self.vy = state
+        self.field = None # Each worker evaluates the field for its own slice
+        
+        context = multiprocessing.get_context("spawn")
+        self.control = context.RawArray('d', CONTROL_SIZE)
+        self.barrier = context.Barrier(workers + 1)
+        
+        bounds = np.linspace(0, count, workers + 1).astype(int)
+        self.workers = [
+            context.Process(target=advect_shard, daemon=True,
+                                    args=(self.shm.name, count, int(start), int(end), sampled, self.control, self.barrier))
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        for worker in self.workers:
+            worker.start()
+        
+        # Spawned workers take a moment to import; wait here so the first update() doesn't
+        try:
+            self.barrier.wait(timeout=PARALLEL_STOP_TIMEOUT)
+        except threading.BrokenBarrierError:
+            self.close()
+            raise RuntimeError("particle workers failed to start") from None
+
+    def update(self, time, mouse):
+        self.control[CONTROL_TIME] = time
+        self.control[CONTROL_HAS_MOUSE] = mouse is not None
+        if mouse is not None:
+            self.control[CONTROL_MOUSE_X] = mouse.x
+            self.control[CONTROL_MOUSE_Y] = mouse.y
+        
+        # A worker that died while parked at the barrier can leave its shared state
+        # inconsistent enough to hang even a timed wait, so check before entering it
+        try:
+            if not all(worker.is_alive() for worker in self.workers):
+                raise threading.BrokenBarrierError
+            self.barrier.wait(timeout=PARALLEL_STEP_TIMEOUT) # Release the workers on this snapshot
+            self.barrier.wait(timeout=PARALLEL_STEP_TIMEOUT) # Every slice has been advanced
+        except threading.BrokenBarrierError:
+            self.close()
+            raise RuntimeError("a particle worker stopped responding; parallel backend shut down") from None
+
+    def close(self):
+        if self.shm is None:
+            return
+        self.control[CONTROL_STOP] = 1
+        # A dead worker can leave the barrier's shared state inconsistent, so only stop
+        # the workers through it while they are all alive; otherwise terminate them
+        if not self.barrier.broken and all(worker.is_alive() for worker in self.workers):
+            try:
+                self.barrier.wait(timeout=PARALLEL_STOP_TIMEOUT)
+            except threading.BrokenBarrierError:
+                self.barrier.abort() # Release any worker still waiting; they exit on the broken barrier
+        
+        try:
+            for worker in self.workers:
+                worker.join(PARALLEL_STOP_TIMEOUT)
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+        finally:
+            # Keep the final positions readable after the shared block is gone
+            self.x, self.y, self.vx, self.vy = (a.copy() for a in (self.x, self.y, self.vx, self.vy))
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+PARTICLE_BACKENDS = {
+    "object": lambda xs, ys: ObjectParticles(xs, ys),
+    "numpy": lambda xs, ys: ArrayParticles(xs, ys),
+    "grid": lambda xs, ys: ArrayParticles(xs, ys, sampled=True),
+    "parallel": lambda xs, ys: ParallelParticles(xs, ys),
+    "parallel-grid": lambda xs, ys: ParallelParticles(xs, ys, sampled=True),
+}
+
+
+def random_particle_positions(count, seed=None):
+    """Uniform random start positions (integers, like GetRandomValue) from a seeded generator."""
+    rng = random.Random(seed)
+    xs = [rng.randint(0, SCREEN_WIDTH) for _ in range(count)]
+    ys = [rng.randint(0, SCREEN_HEIGHT) for _ in range(count)]
+    return xs, ys
+
+
+# --- Flow Visualization ---
+
+def trace_streamlines(field, seed_x, seed_y, steps, step_size, width, height):
+    """
+    Integrates every seed forwards and backwards along the field with RK4, all seeds and
+    both directions advancing together as one NumPy batch. Returns a float32 array of
+    shape (seeds, 2 * steps + 1, 2) with the backward half reversed in front of the seed,
+    plus the first and last valid point index of each line (lines stop at the screen edge).
+    """
+    count = len(seed_x)
+    points = np.empty((count, 2 * steps + 1, 2), dtype=np.float32)
+    points[:, steps, 0] = seed_x
+    points[:, steps, 1] = seed_y
+    first = np.full(count, steps)
+    last = np.full(count, steps)
+    
+    # First half of the batch runs forwards, second half backwards
+    h = np.concatenate([np.full(count, step_size), np.full(count, -step_size)])
+    z = np.concatenate([seed_x + 1j * seed_y] * 2)
+    alive = np.ones(2 * count, dtype=bool)
+    
+    for k in range(1, steps + 1):
+        # Classic RK4 on the unit-speed direction field, positions as x + i*y
+        k1 = field.sample_direction(z)
+        k2 = field.sample_direction(z + 0.5 * h * k1)
+        k3 = field.sample_direction(z + 0.5 * h * k2)
+        k4 = field.sample_direction(z + h * k3)
+        z = z + h / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4)
+        alive &= (z.real >= 0) & (z.real <= width) & (z.imag >= 0) & (z.imag <= height)
+        
+        points[:, steps + k, 0] = z.real[:count]
+        points[:, steps + k, 1] = z.imag[:count]
+        points[:, steps - k, 0] = z.real[count:]
+        points[:, steps - k, 1] = z.imag[count:]
+        last[alive[:count]] = steps + k
+        first[alive[count:]] = steps - k
+        
+        if not alive.any():
+            break
+                
+    return points, first, last
+
+
+def compute_lic_rows(field, noise, row_start, row_end, scale, kernel_steps):
+    """
+    Line integral convolution for texture rows [row_start, row_end): every pixel averages
+    the noise image along the streamline through it, `kernel_steps` one-pixel steps each
+    way. All pixels of the batch, in both directions, are advected together.
+    Returns brightness in [0, 1].
+    """
+    tex_h, tex_w = noise.shape
+    rows, cols = np.mgrid[row_start:row_end, 0:tex_w]
+    
+    total = noise[rows, cols].astype(np.float64)
+    start = ((cols + 0.5) + 1j * (rows + 0.5)) * scale
+    step = np.stack([np.full(rows.shape, float(scale)), np.full(rows.shape, -float(scale))])
+    z = np.stack([start, start])
+    
+    for _ in range(kernel_steps):
+        z = z + step * field.sample_direction(z)
+        # Wrap so kernels near the edge keep sampling noise instead of piling up
+        values = noise[(z.imag / scale).astype(np.intp) % tex_h, (z.real / scale).astype(np.intp) % tex_w]
+        total += values[0] + values[1]
+            
+    samples = 2 * kernel_steps + 1
+    average = total / samples
+    
+    # Averaging n uniform samples shrinks the spread by sqrt(n); stretch it back
+    contrast = math.sqrt(samples) * 0.6
+    return np.clip((average - 0.5) * contrast + 0.5, 0.0, 1.0)
+
+
+# --- Render Layers ---
+
+class TrailBuffer:
+    """
+    Persistent render target that particles are drawn into. Previous contents fade
+    towards black by exponential decay measured in seconds, not frames, so trails
+    keep the same length at any frame rate.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.target = LoadRenderTexture(width, height)
+        self.pending_decay = 0.0 # Seconds of decay not yet applied to the buffer
+        
+        BeginTextureMode(self.target)
+        ClearBackground(BLACK)
+        EndTextureMode()
+
+    def begin(self, dt):
+        """Starts drawing into the buffer, first fading what is there by dt seconds."""
+        BeginTextureMode(self.target)
+        
+        # Fraction of brightness removed after the pending time: 1 - 0.5^(t / half_life)
+        self.pending_decay += dt
+        fade = 1.0 - 0.5 ** (self.pending_decay / TRAIL_HALF_LIFE)
+        alpha = int(255 * fade)
+        
+        # The buffer only stores 8 bits per channel, and a fade of `alpha` rounds away
+        # nothing from channels below 255 / (2 * alpha), so small per-frame fades would
+        # leave a haze that depends on the frame rate. Keep the remainder until it adds
+        # up to TRAIL_MIN_FADE_ALPHA, then subtract that rounding floor outright.
+        if alpha >= TRAIL_MIN_FADE_ALPHA:
+            DrawRectangle(0, 0, self.width, self.height, Color(0, 0, 0, alpha))
+            floor = math.ceil(255 / (2 * alpha))
+            rlSetBlendFactors(RL_ONE, RL_ONE, RL_FUNC_REVERSE_SUBTRACT) # Buffer minus color
+            BeginBlendMode(BLEND_CUSTOM)
+            DrawRectangle(0, 0, self.width, self.height, Color(floor, floor, floor, 0))
+            EndBlendMode()
+            applied = -TRAIL_HALF_LIFE * math.log2(1.0 - alpha / 255.0)
+            self.pending_decay = max(0.0, self.pending_decay - applied)
+
+    def end(self):
+        EndTextureMode()
+
+    def draw(self):
+        # Black means "no trail", so adding colors composites the trails over whatever
+        # has already been drawn without hiding it.
+        BeginBlendMode(BLEND_ADD_COLORS)
+        # Render textures are stored upside down, hence the negative source height
+        DrawTextureRec(self.target.texture, Rectangle(0, 0, self.width, -self.height), Vector2(0, 0), WHITE)
+        EndBlendMode()
+
+    def unload(self):
+        UnloadRenderTexture(self.target)
+
+
+class ArrowLayer:
+    """
+    Cached render of the field arrow grid. The field only drifts slowly with time, so
+    the arrows are redrawn once per time bucket of FIELD_REBUILD_INTERVAL seconds, or
+    straight away when the mouse repeller moves, is pressed or is released.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.target = LoadRenderTexture(width, height)
+        self.field_key = None # Field key (see get_field_key) the cached arrows were drawn for
+
+    def update(self, field_key):
+        if field_key == self.field_key:
+            return
+        self.field_key = field_key
+        time, mouse = field_key
+        
+        BeginTextureMode(self.target)
+        ClearBackground(BLANK)
+        draw_field_arrows(time, None if mouse is None else Vector2(*mouse))
+        EndTextureMode()
+
+    def draw(self):
+        DrawTextureRec(self.target.texture, Rectangle(0, 0, self.width, -self.height), Vector2(0, 0), WHITE)
+
+    def unload(self):
+        UnloadRenderTexture(self.target)
+
+
+class StreamlineLayer:
+    """Cached render of RK4 streamlines traced from evenly spaced seeds over a SampledField."""
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.target = LoadRenderTexture(width, height)
+        self.field_key = None
+        
+        # Seeds sit in the middle of each cell of an even lattice
+        half = STREAMLINE_SEED_SPACING / 2
+        seed_x, seed_y = np.meshgrid(np.arange(half, width, STREAMLINE_SEED_SPACING),
+                                     np.arange(half, height, STREAMLINE_SEED_SPACING))
+        self.seed_x = seed_x.ravel()
+        self.seed_y = seed_y.ravel()
+
+    def update(self, field_key, field):
+        if field_key == self.field_key:
+            return
+        self.field_key = field_key
+        
+        points, first, last = trace_streamlines(field, self.seed_x, self.seed_y, STREAMLINE_STEPS,
+                                                STREAMLINE_STEP_SIZE, self.width, self.height)
+        
+        BeginTextureMode(self.target)
+        ClearBackground(BLANK)
+        for line, start, end in zip(points, first, last):
+            if end > start:
+                # One call per line: the point rows are handed to raylib as a Vector2 array
+                strip = line[start:end + 1]
+                DrawLineStrip(ffi.cast("Vector2 *", ffi.from_buffer(strip)), len(strip), STREAMLINE_COLOR)
+        EndTextureMode()
+
+    def draw(self):
+        DrawTextureRec(self.target.texture, Rectangle(0, 0, self.width, -self.height), Vector2(0, 0), WHITE)
+
+    def unload(self):
+        UnloadRenderTexture(self.target)
+
+
+class LicLayer:
+    """
+    Line integral convolution texture. Rebuilding it takes too long for one frame, so a
+    rebuild computes LIC_ROWS_PER_FRAME rows per frame against a snapshot of the field
+    and swaps the finished image in; the previous image stays on screen meanwhile.
+    A rebuild always runs to completion before the next one starts from the newest field.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.tex_w = width // LIC_SCALE
+        self.tex_h = height // LIC_SCALE
+        
+        rng = np.random.default_rng(LIC_NOISE_SEED)
+        self.noise = rng.random((self.tex_h, self.tex_w), dtype=np.float32)
+        self.pixels = np.zeros((self.tex_h, self.tex_w), dtype=np.uint8)
+        
+        # Grayscale texture fed directly from the pixel array
+        image = Image(ffi.cast("void *", ffi.from_buffer(self.pixels)), self.tex_w, self.tex_h, 1,
+                      PIXELFORMAT_UNCOMPRESSED_GRAYSCALE)
+        self.texture = LoadTextureFromImage(image)
+        SetTextureFilter(self.texture, TEXTURE_FILTER_BILINEAR)
+        
+        self.field_key = None # Key of the image currently on screen
+        self.job_key = None   # Key of the image being computed
+        self.job_field = None
+        self.job_row = 0
+
+    def update(self, field_key, field):
+        if self.job_field is None and field_key != self.field_key:
+            self.job_key = field_key
+            self.job_field = field
+            self.job_row = 0
+            
+        if self.job_field is None:
+            return
+            
+        row_end = min(self.job_row + LIC_ROWS_PER_FRAME, self.tex_h)
+        brightness = compute_lic_rows(self.job_field, self.noise, self.job_row, row_end, LIC_SCALE, LIC_KERNEL_STEPS)
+        self.pixels[self.job_row:row_end] = (brightness * 255).astype(np.uint8)
+        self.job_row = row_end
+        
+        if self.job_row == self.tex_h:
+            UpdateTexture(self.texture, ffi.from_buffer(self.pixels))
+            self.field_key = self.job_key
+            self.job_key = None
+            self.job_field = None
+
+    def draw(self):
+        DrawTexturePro(self.texture, Rectangle(0, 0, self.tex_w, self.tex_h),
+                       Rectangle(0, 0, self.width, self.height), Vector2(0, 0), 0.0, FIELD_COLOR)
+
+    def unload(self):
+        UnloadTexture(self.texture)
+
+
+# --- Headless Benchmark ---
+
+def run_benchmark(count, steps, seed, backends, dt=1.0 / 60.0):
+    """
+    Advances `count` particles for `steps` fixed steps with each backend, without a window,
+    and prints throughput plus a checksum of the final positions. Every backend starts
+    from the same seeded positions; the deviation column is measured against the first
+    backend listed.
+    """
+    xs, ys = random_particle_positions(count, seed)
+    print(f"{count} particles, {steps} steps, seed {seed}, dt {dt:.4f}")
+    print(f"{'backend':<14}{'seconds':>10}{'particle-steps/s':>20}  {'checksum':<14}{'mean dev (px)':>14}{'max dev (px)':>14}")
+    
+    reference = None
+    for name in backends:
+        system = PARTICLE_BACKENDS[name](xs, ys)
+        current_time = 0.0
+        
+        start = clock.perf_counter()
+        for _ in range(steps):
+            current_time += dt
+            system.update(current_time, None)
+        elapsed = clock.perf_counter() - start
+        
+        positions = system.positions()
+        system.close()
+        checksum = hashlib.sha1(positions.tobytes()).hexdigest()[:12]
+        if reference is None:
+            reference = positions
+        
+        # Shortest distance on the wrapped screen, so a particle that wrapped in one run
+        # and not the other does not count as a full screen width apart
+        delta = np.abs(positions.astype(np.float64) - reference)
+        delta = np.minimum(delta, np.array([SCREEN_WIDTH, SCREEN_HEIGHT]) - delta)
+        deviation = np.hypot(delta[:, 0], delta[:, 1])
+        
+        rate = count * steps / elapsed if elapsed > 0 else float("inf")
+        print(f"{name:<14}{elapsed:>10.3f}{rate:>20,.0f}  {checksum:<14}{deviation.mean():>14.4f}{deviation.max():>14.4f}")
+
+
 # --- Main Application ---
 
 def main():
@@ -106,62 +784,98 @@ def main():
     MOUSE_BUTTON_LEFT = 0 
     
     # Initialize Particles
-    particles = []
-    for _ in range(PARTICLE_COUNT):
-        x = GetRandomValue(0, SCREEN_WIDTH)
-        y = GetRandomValue(0, SCREEN_HEIGHT)
-        particles.append(Particle(x, y))
+    xs, ys = random_particle_positions(PARTICLE_COUNT)
+    particles = PARTICLE_BACKENDS[PARTICLE_BACKEND](xs, ys)
     
+    # Initialize Render Layers
+    trails = TrailBuffer(SCREEN_WIDTH, SCREEN_HEIGHT)
+    arrows = ArrowLayer(SCREEN_WIDTH, SCREEN_HEIGHT)
+    streamlines = StreamlineLayer(SCREEN_WIDTH, SCREEN_HEIGHT)
+    lic = LicLayer(SCREEN_WIDTH, SCREEN_HEIGHT)
+    
+    view = VIEW_PARTICLES
+    sampled_field = None # SampledField for sampled_field_key, built on demand
+    sampled_field_key = None
     current_time = 0.0
 
     while not WindowShouldClose():
         dt = GetFrameTime()
         current_time += dt
+        
+        if IsKeyPressed(KEY_M):
+            view = (view + 1) % len(VIEW_NAMES)
+        
+        # Sample the mouse once per frame instead of once per field evaluation
+        mouse = GetMousePosition() if IsMouseButtonDown(MOUSE_BUTTON_LEFT) else None
+        field_key = get_field_key(current_time, mouse, FIELD_REBUILD_INTERVAL)
+
+        if view == VIEW_PARTICLES:
+            # --- Update Particles ---
+            particles.update(current_time, mouse)
 
-        # --- Update Particles ---
-        for p in particles:
-            field_vec = get_field_vector(p.position.x, p.position.y, current_time)
-            p.update(field_vec, dt)
+            # --- Update Render Layers ---
+            arrows.update(field_key)
+            
+            trails.begin(dt)
+            particles.draw()
+            trails.end()
+        else:
+            # --- Update Flow Layers (only when the field key changes) ---
+            # A LIC rebuild spans many frames, so it gets a much coarser time bucket
+            if view == VIEW_LIC:
+                field_key = get_field_key(current_time, mouse, LIC_REBUILD_INTERVAL)
+            if sampled_field_key != field_key:
+                time, mouse_pos = field_key
+                sampled_field = SampledField(SCREEN_WIDTH, SCREEN_HEIGHT, FIELD_SAMPLE_SPACING, time,
+                                             None if mouse_pos is None else Vector2(*mouse_pos))
+                sampled_field_key = field_key
+                
+            if view == VIEW_STREAMLINES:
+                streamlines.update(field_key, sampled_field)
+            else:
+                lic.update(field_key, sampled_field)
 
         # --- Draw ---
         BeginDrawing()
+        ClearBackground(BACKGROUND_COLOR)
         
-        # Clear background with a partial fade to create particle trails
-        DrawRectangle(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, Color(
-            BACKGROUND_COLOR.r, 
-            BACKGROUND_COLOR.g, 
-            BACKGROUND_COLOR.b, 
-            int(255 * (1.0 - TRAIL_LENGTH)) # Apply alpha based on TRAIL_LENGTH
-        )) 
-        
-        # --- Draw Vector Field Grid ---
-        # This section ensures the field is drawn every single frame
-        for i in range(0, SCREEN_WIDTH, GRID_SIZE):
-            for j in range(0, SCREEN_HEIGHT, GRID_SIZE):
-                
-                start = Vector2(i, j)
-                field_vec = get_field_vector(i, j, current_time)
-                
-                # Normalize and scale vector for drawing length
-                field_len = Vector2Length(field_vec)
-                if field_len > 0:
-                    field_vec = Vector2Scale(field_vec, GRID_SIZE * 0.3 / field_len) 
-                
-                end = Vector2Add(start, field_vec)
-                
-                DrawLineV(start, end, FIELD_COLOR)
-                DrawCircleV(end, 2, FIELD_COLOR) # Simple dot/arrow head
-
-        # --- Draw Particles ---
-        for p in particles:
-            p.draw()
+        if view == VIEW_PARTICLES:
+            arrows.draw()
+            trails.draw()
+        elif view == VIEW_STREAMLINES:
+            streamlines.draw()
+        else:
+            lic.draw()
             
         DrawFPS(10, 10)
         DrawText(b"LEFT CLICK: Repel Particles", 10, 40, 20, GRAY)
+        DrawText(f"M: Switch View ({VIEW_NAMES[view]})".encode('utf-8'), 10, 65, 20, GRAY)
 
         EndDrawing()
 
+    particles.close()
+    trails.unload()
+    arrows.unload()
+    streamlines.unload()
+    lic.unload()
     CloseWindow()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Interactive vector field simulation.")
+    parser.add_argument("--bench", action="store_true", help="run the headless particle benchmark instead of the demo")
+    parser.add_argument("--particles", type=int, default=PARTICLE_COUNT, help="benchmark particle count")
+    parser.add_argument("--steps", type=int, default=120, help="benchmark step count")
+    parser.add_argument("--seed", type=int, default=1, help="benchmark random seed")
+    parser.add_argument("--backend", choices=PARTICLE_BACKENDS, default=PARTICLE_BACKEND,
+                        help="particle backend for the demo (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=PARALLEL_WORKERS, help="worker processes for the parallel backends")
+    parser.add_argument("--backends", default="object,numpy,grid",
+                        help="comma-separated backends to benchmark: " + ", ".join(PARTICLE_BACKENDS))
+    args = parser.parse_args()
+    
+    PARALLEL_WORKERS = args.workers
+    PARTICLE_BACKEND = args.backend
+    if args.bench:
+        run_benchmark(args.particles, args.steps, args.seed, args.backends.split(","))
+    else:
+        main()
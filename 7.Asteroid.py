@@ -1,7 +1,12 @@
+import argparse
 import random
 import math
+import numpy as np
 from raylib import *
 
+from shooter import (BatchRenderer, Column, Entity, EntityStore, Pool, PooledEntity, SystemTimings,
+                     freeze_heap, play_headless)
+
 # --- Game Constants ---
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
@@ -11,6 +16,9 @@ THRUST_ACCEL = 150.0    # Acceleration rate (pixels/s/s)
 MAX_SPEED = 400.0       # Max velocity for the ship
 BULLET_SPEED = 600.0
 FIRE_RATE = 0.2         # Seconds between shots
+HASH_CELL_SIZE = 100    # Spatial hash cell size in pixels (an 8x6 grid on 800x600)
+BULLET_POOL_SIZE = 32   # Max bullets alive at once (2s lifetime / 0.2s fire rate = 10)
+ASTEROID_POOL_SIZE = 64 # Max asteroids alive at once (4 large split into at most 28)
 
 # Asteroid Sizes (Radius and points)
 ASTEROID_SIZES = {
@@ -19,52 +27,49 @@ ASTEROID_SIZES = {
     1: (15, 100)  # Small
 }
 
+ASTEROID_COLOR = GRAY
+ASTEROID_VERTICES = 12        # Corners per asteroid outline
+ASTEROID_SHAPE_VARIANTS = 8   # Pre-generated outlines per size level
+ASTEROID_JAGGEDNESS = 0.35    # Corners sit between (1 - this) and 1 times the radius
+ASTEROID_SHAPE_SEED = 7       # Fixed, so the outline set is the same every run
+SHIP_CORNER_ANGLES = np.array([0.0, 120.0, 240.0]) # Triangle corners relative to the ship's rotation
+
+# Per-frame input bits: everything the player contributes to a frame, so the game
+# can be driven by the keyboard or by a scripted bot through the same interface
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_THRUST = 4
+INPUT_FIRE = 8      # Fire/start pressed this frame
+INPUT_RESTART = 16  # Restart pressed this frame
+
+SOAK_DELTA_TIME = 1 / 60 # Fixed frame time of a headless soak run
+
 # --- Game Object Classes ---
 
-class Entity:
-    """Base class for Ship, Bullet, and Asteroid to handle common movement and screen wrapping."""
-    def __init__(self, x, y, vx, vy):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.is_active = True
+class AsteroidStore(EntityStore):
+    """EntityStore plus the asteroid outline column."""
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.shape = np.zeros(capacity, dtype=np.intp) # Asteroid outline index (see AsteroidShapes)
 
-    def update(self, delta_time):
-        if not self.is_active:
-            return
-            
-        # Apply velocity to position
-        self.x += self.vx * delta_time
-        self.y += self.vy * delta_time
-
-        # Screen Wrapping
-        if self.x > SCREEN_WIDTH:
-            self.x = 0
-        elif self.x < 0:
-            self.x = SCREEN_WIDTH
-            
-        if self.y > SCREEN_HEIGHT:
-            self.y = 0
-        elif self.y < 0:
-            self.y = SCREEN_HEIGHT
 
 class Ship(Entity):
-    def __init__(self, x, y):
-        super().__init__(x, y, 0.0, 0.0)
+    __slots__ = ('rotation', 'thrusting', 'can_fire_timer', 'lives')
+    
+    def __init__(self, store, x, y):
+        super().__init__(store, x, y, 0.0, 0.0)
         self.rotation = 90.0 # Facing UP initially (90 degrees in Raylib's system)
         self.thrusting = False
         self.radius = SHIP_SIZE
         self.can_fire_timer = 0.0
         self.lives = 3
 
-    def update(self, delta_time):
-        super().update(delta_time)
-        
+    def update(self, delta_time, buttons):
+        """Steering and thrust from the frame's input bits; the store moves and wraps the ship afterwards."""
         # --- 1. Rotation ---
-        if IsKeyDown(KEY_LEFT) or IsKeyDown(KEY_A):
+        if buttons & INPUT_LEFT:
             self.rotation -= ROTATION_SPEED * delta_time
-        if IsKeyDown(KEY_RIGHT) or IsKeyDown(KEY_D):
+        if buttons & INPUT_RIGHT:
             self.rotation += ROTATION_SPEED * delta_time
             
         # Normalize rotation (keep it between 0 and 360)
@@ -72,7 +77,7 @@ class Ship(Entity):
 
         # --- 2. Thrust (Acceleration) ---
         self.thrusting = False
-        if IsKeyDown(KEY_UP) or IsKeyDown(KEY_W):
+        if buttons & INPUT_THRUST:
             self.thrusting = True
             
             # Convert rotation degree to radians for trig functions (math.cos/sin)
@@ -107,7 +112,13 @@ class Ship(Entity):
         if self.can_fire_timer > 0:
             self.can_fire_timer -= delta_time
 
-    def fire_bullet(self):
+    def hull(self):
+        """The ship's triangle as a (3, 2) array of corners relative to its center."""
+        corners = np.radians(self.rotation + SHIP_CORNER_ANGLES)
+        return SHIP_SIZE * np.column_stack((np.cos(corners), np.sin(corners)))
+
+    def fire_bullet(self, bullets):
+        """Fires a bullet from the `bullets` pool if the fire timer allows it."""
         if self.can_fire_timer <= 0:
             # Calculate bullet direction based on ship rotation
             angle_rad = math.radians(self.rotation - 90)
@@ -121,14 +132,16 @@ class Ship(Entity):
             bv_y = BULLET_SPEED * math.sin(angle_rad)
             
             self.can_fire_timer = FIRE_RATE
-            return Bullet(start_x, start_y, bv_x + self.vx, bv_y + self.vy) # Add ship's velocity
+            return bullets.acquire(start_x, start_y, bv_x + self.vx, bv_y + self.vy) # Add ship's velocity
 
-    def draw(self):
-        # Raylib DrawPolyEx works well for triangles with rotation
+    def draw(self, renderer):
         # Draw a simple triangle centered at (self.x, self.y) with size=SHIP_SIZE and rotation=self.rotation
         
-        # Use a classic triangle outline for the Asteroids look
-        DrawPolyLinesEx((self.x, self.y), 3, SHIP_SIZE, self.rotation, 2, WHITE)
+        # Use a classic triangle outline for the Asteroids look (corners as DrawPolyLinesEx places them)
+        hull = self.hull()
+        px = self.x + hull[:, 0]
+        py = self.y + hull[:, 1]
+        renderer.add_lines(px, py, np.roll(px, -1), np.roll(py, -1), WHITE, thickness=2)
         
         # Draw the engine flame if thrusting
         if self.thrusting:
@@ -136,199 +149,527 @@ class Ship(Entity):
             angle_rad = math.radians(self.rotation - 90 + 180) # Opposite direction
             flame_x = self.x + (SHIP_SIZE - 5) * math.cos(angle_rad)
             flame_y = self.y + (SHIP_SIZE - 5) * math.sin(angle_rad)
-            DrawCircle(int(flame_x), int(flame_y), 3, RED)
-
+            renderer.add_circles(flame_x, flame_y, 3, RED, segments=8)
 
-class Bullet(Entity):
-    def __init__(self, x, y, vx, vy):
-        super().__init__(x, y, vx, vy)
-        self.radius = 2
-        self.lifetime = 2.0 # Bullet disappears after 2 seconds
 
-    def update(self, delta_time):
-        super().update(delta_time)
-        self.lifetime -= delta_time
-        if self.lifetime <= 0:
-            self.is_active = False
-
-    def draw(self):
-        if self.is_active:
-            DrawCircle(int(self.x), int(self.y), self.radius, YELLOW)
+class Bullet(PooledEntity):
+    __slots__ = ()
+    
+    def __init__(self, store):
+        super().__init__(store, 2)
 
+    def spawn(self, x, y, vx, vy):
+        self.x, self.y = x, y
+        self.vx, self.vy = vx, vy
+        self.lifetime = 2.0 # Bullet disappears after 2 seconds (see EntityStore.decay_lifetimes)
+        self.is_active = True
 
-class Asteroid(Entity):
-    def __init__(self, x, y, vx, vy, size_level):
-        super().__init__(x, y, vx, vy)
+    @staticmethod
+    def draw_all(renderer, store, slots):
+        renderer.add_circles(store.x[slots], store.y[slots], store.radius[slots], YELLOW, segments=8)
+
+
+class AsteroidShapes:
+    """
+    Jagged, star-shaped asteroid outlines, generated once: ASTEROID_SHAPE_VARIANTS per
+    size level, each an array of corners around the origin. A spawning asteroid just
+    picks one by index. Every outline is also kept as a fan of triangles from its
+    center; being star-shaped, each triangle is convex, which is what SAT needs.
+    """
+    def __init__(self, seed=ASTEROID_SHAPE_SEED):
+        rng = np.random.default_rng(seed)
+        self.levels = sorted(ASTEROID_SIZES)
+        angles = np.linspace(0.0, 2 * math.pi, ASTEROID_VERTICES, endpoint=False)
+        outlines = []
+        for level in self.levels:
+            radius = ASTEROID_SIZES[level][0]
+            for _ in range(ASTEROID_SHAPE_VARIANTS):
+                # Jitter each corner's distance and (a little) its angle
+                r = radius * (1 - ASTEROID_JAGGEDNESS * rng.random(ASTEROID_VERTICES))
+                a = angles + rng.uniform(-0.25, 0.25, ASTEROID_VERTICES) * (2 * math.pi / ASTEROID_VERTICES)
+                outlines.append(np.column_stack((r * np.cos(a), r * np.sin(a))))
+        self.outlines = np.array(outlines)              # (shapes, corners, 2)
+        self.sectors = np.zeros(self.outlines.shape[:2] + (3, 2))
+        self.sectors[:, :, 1] = self.outlines           # Corner 0 stays at the center
+        self.sectors[:, :, 2] = np.roll(self.outlines, -1, axis=1)
+
+    def pick(self, size_level, rng):
+        """Index of a random outline for the given size level."""
+        return self.levels.index(size_level) * ASTEROID_SHAPE_VARIANTS + rng.randrange(ASTEROID_SHAPE_VARIANTS)
+
+
+ASTEROID_SHAPES = AsteroidShapes()
+
+
+class Asteroid(PooledEntity):
+    __slots__ = ('rng', 'size_level', 'points')
+    
+    shape = Column('shape')
+    
+    def __init__(self, store, rng):
+        super().__init__(store)
+        self.rng = rng # The game's seeded RNG, shared by every asteroid
+        self.size_level = 1
+        self.radius, self.points = ASTEROID_SIZES[1]
+
+    def spawn(self, x, y, vx, vy, size_level):
+        self.x, self.y = x, y
+        self.vx, self.vy = vx, vy
         self.size_level = size_level # 3=Large, 2=Medium, 1=Small
         self.radius, self.points = ASTEROID_SIZES[size_level]
-        self.color = GRAY
+        self.shape = ASTEROID_SHAPES.pick(size_level, self.rng)
+        self.is_active = True
         
-    def draw(self):
-        if self.is_active:
-            # Draw a simple circle for the asteroid, larger for bigger ones
-            DrawCircleLines(int(self.x), int(self.y), self.radius, self.color)
-            DrawCircle(int(self.x), int(self.y), 2, self.color) # Center dot for visibility
+    @staticmethod
+    def draw_all(renderer, store, slots):
+        x, y = store.x[slots], store.y[slots]
+        # Every asteroid's outline as one line list: corner i to corner i+1
+        outlines = ASTEROID_SHAPES.outlines[store.shape[slots]]
+        px = outlines[:, :, 0] + x[:, None]
+        py = outlines[:, :, 1] + y[:, None]
+        renderer.add_lines(px, py, np.roll(px, -1, axis=1), np.roll(py, -1, axis=1), ASTEROID_COLOR)
+        renderer.add_circles(x, y, 2, ASTEROID_COLOR, segments=6) # Center dot for visibility
 
     @staticmethod
-    def create_small_asteroids(asteroid):
-        """Creates 2-3 smaller asteroids when a larger one is destroyed."""
-        new_asteroids = []
+    def create_small_asteroids(asteroid, asteroids):
+        """Spawns 2 smaller asteroids from the `asteroids` pool when a larger one is destroyed."""
         if asteroid.size_level > 1:
             new_size = asteroid.size_level - 1
             
             # Spawn 2 new asteroids with randomized velocity
             for _ in range(2):
                 # Random angle and speed
-                angle = random.uniform(0, 2 * math.pi)
-                speed = random.uniform(50, 200)
+                angle = asteroid.rng.uniform(0, 2 * math.pi)
+                speed = asteroid.rng.uniform(50, 200)
                 
                 new_vx = speed * math.cos(angle)
                 new_vy = speed * math.sin(angle)
                 
                 # Spawn slightly offset from parent position
-                new_asteroids.append(Asteroid(asteroid.x + random.randint(-5, 5), 
-                                              asteroid.y + random.randint(-5, 5), 
-                                              new_vx, new_vy, new_size))
-        return new_asteroids
-
-
-def spawn_initial_asteroids(num_asteroids, size_level):
-    """Initializes a list of large asteroids."""
-    asteroids = []
-    
+                asteroids.acquire(asteroid.x + asteroid.rng.randint(-5, 5), 
+                                  asteroid.y + asteroid.rng.randint(-5, 5), 
+                                  new_vx, new_vy, new_size)
+
+
+# --- Collision Helpers ---
+
+def wrapped_offset(x1, y1, x2, y2):
+    """(x2, y2) relative to (x1, y1), the short way around the wrapped screen."""
+    dx = (x2 - x1 + SCREEN_WIDTH / 2) % SCREEN_WIDTH - SCREEN_WIDTH / 2
+    dy = (y2 - y1 + SCREEN_HEIGHT / 2) % SCREEN_HEIGHT - SCREEN_HEIGHT / 2
+    return dx, dy
+
+
+def _edge_normals(triangles):
+    """(n, 3, 2) triangles -> (n, 3, 2) normals of their edges (not normalized)."""
+    edges = np.roll(triangles, -1, axis=1) - triangles
+    return np.stack((-edges[..., 1], edges[..., 0]), axis=-1)
+
+
+def _project(triangles, axes):
+    """Min and max of each triangle's corners along each of its axes: (n, k) arrays."""
+    dots = np.einsum('ncd,nkd->nkc', triangles, axes)
+    return dots.min(axis=2), dots.max(axis=2)
+
+
+def triangle_hits_sectors(triangle, sectors):
+    """
+    Separating axis test of one triangle (3, 2) against a fan of convex sectors (n, 3, 2)
+    in the same frame. The shapes overlap unless some edge normal of either separates them.
+    """
+    triangles = np.broadcast_to(triangle, sectors.shape)
+    axes = np.concatenate((_edge_normals(triangles), _edge_normals(sectors)), axis=1)
+    a_min, a_max = _project(triangles, axes)
+    b_min, b_max = _project(sectors, axes)
+    separated = (a_max < b_min) | (b_max < a_min)
+    return bool((~separated.any(axis=1)).any())
+
+
+def circle_hits_sectors(cx, cy, radius, sectors):
+    """
+    Separating axis test of a circle against a fan of convex sectors (n, 3, 2). The axes
+    are each sector's edge normals plus the direction from its nearest corner to the circle.
+    """
+    center = np.array((cx, cy))
+    to_center = center - sectors
+    nearest = np.argmin((to_center * to_center).sum(axis=2), axis=1)
+    corner_axis = to_center[np.arange(len(sectors)), nearest]
+    axes = np.concatenate((_edge_normals(sectors), corner_axis[:, None, :]), axis=1)
+    lengths = np.linalg.norm(axes, axis=2, keepdims=True)
+    axes = np.divide(axes, lengths, out=np.tile([1.0, 0.0], axes.shape[:2] + (1,)), where=lengths > 0)
+    s_min, s_max = _project(sectors, axes)
+    c = axes @ center
+    separated = (s_max < c - radius) | (c + radius < s_min)
+    return bool((~separated.any(axis=1)).any())
+
+
+def swept_circles_toi(dx, dy, ddx, ddy, radii):
+    """
+    Earliest fraction t in [0, 1] of the frame at which two moving circles touch, or None
+    if they stay apart. (dx, dy) is their offset at the start of the frame and (ddx, ddy)
+    how that offset changes over the frame; circles overlapping at the start give 0.
+    """
+    c = dx * dx + dy * dy - radii * radii
+    if c <= 0:
+        return 0.0
+    a = ddx * ddx + ddy * ddy
+    b = dx * ddx + dy * ddy
+    if a == 0 or b >= 0: # Not moving relative to each other, or moving apart
+        return None
+    disc = b * b - a * c
+    if disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else None
+
+
+def _point_segment_distance(px, py, ax, ay, bx, by):
+    """Distance from points (px, py) to segments a-b; all arguments broadcast."""
+    abx, aby = bx - ax, by - ay
+    length2 = abx * abx + aby * aby
+    t = np.clip(((px - ax) * abx + (py - ay) * aby) / np.where(length2 > 0, length2, 1.0), 0.0, 1.0)
+    return np.hypot(px - (ax + t * abx), py - (ay + t * aby))
+
+
+def swept_circle_hits_outline(x0, y0, x1, y1, radius, shape):
+    """
+    Does a circle moving from (x0, y0) to (x1, y1) (relative to the asteroid) touch the
+    outline at any point of the move? It does if it overlaps at the start, or if its path
+    comes within `radius` of an outline edge.
+    """
+    if circle_hits_sectors(x0, y0, radius, ASTEROID_SHAPES.sectors[shape]):
+        return True
+    outline = ASTEROID_SHAPES.outlines[shape]
+    ax, ay = outline[:, 0], outline[:, 1]
+    bx, by = np.roll(ax, -1), np.roll(ay, -1)
+    # The path crosses an edge when each segment's ends lie on opposite sides of the other
+    path_side = (x1 - x0) * (ay - y0) - (y1 - y0) * (ax - x0)
+    path_side_b = (x1 - x0) * (by - y0) - (y1 - y0) * (bx - x0)
+    edge_side_0 = (bx - ax) * (y0 - ay) - (by - ay) * (x0 - ax)
+    edge_side_1 = (bx - ax) * (y1 - ay) - (by - ay) * (x1 - ax)
+    if ((path_side * path_side_b <= 0) & (edge_side_0 * edge_side_1 <= 0)).any():
+        return True
+    # Otherwise the closest approach is at an end of the path or at an outline corner
+    nearest = min(_point_segment_distance(x1, y1, ax, ay, bx, by).min(),
+                  _point_segment_distance(ax, ay, x0, y0, x1, y1).min())
+    return nearest <= radius
+
+
+class ToroidalSpatialHash:
+    """
+    Uniform grid over the wrapped screen. Each object is stored in every cell its
+    bounding box touches, with cell indices wrapping across the screen edges, so an
+    object straddling an edge is found from both sides. Rebuilt every frame.
+    """
+    def __init__(self, width, height, cell_size):
+        self.cols = max(1, int(width // cell_size))
+        self.rows = max(1, int(height // cell_size))
+        self.cell_width = width / self.cols
+        self.cell_height = height / self.rows
+        self.cells = [[] for _ in range(self.cols * self.rows)]
+
+    def clear(self):
+        for cell in self.cells:
+            cell.clear()
+
+    def _cell_indices(self, x, y, radius):
+        """Yields the index of every cell touched by the circle's bounding box, once each."""
+        first_col = math.floor((x - radius) / self.cell_width)
+        last_col = math.floor((x + radius) / self.cell_width)
+        first_row = math.floor((y - radius) / self.cell_height)
+        last_row = math.floor((y + radius) / self.cell_height)
+        
+        # A box wider than the screen would wrap onto the same cells twice
+        last_col = min(last_col, first_col + self.cols - 1)
+        last_row = min(last_row, first_row + self.rows - 1)
+        
+        for row in range(first_row, last_row + 1):
+            row_start = (row % self.rows) * self.cols
+            for col in range(first_col, last_col + 1):
+                yield row_start + col % self.cols
+
+    def insert(self, obj, x, y, radius):
+        for index in self._cell_indices(x, y, radius):
+            self.cells[index].append(obj)
+
+    def query(self, x, y, radius):
+        """
+        Yields the objects stored in the cells the circle touches. An object spanning
+        several of those cells is yielded once per cell; callers skip inactive objects.
+        """
+        for index in self._cell_indices(x, y, radius):
+            yield from self.cells[index]
+
+
+def spawn_initial_asteroids(asteroids, num_asteroids, size_level, rng):
+    """Spawns the starting large asteroids from the `asteroids` pool."""
     for _ in range(num_asteroids):
         # Spawn near the edges (not near the center where the ship starts)
-        edge = random.choice(["left", "right", "top", "bottom"])
+        edge = rng.choice(["left", "right", "top", "bottom"])
         if edge == "left":
-            x, y = random.uniform(-50, 0), random.uniform(0, SCREEN_HEIGHT)
+            x, y = rng.uniform(-50, 0), rng.uniform(0, SCREEN_HEIGHT)
         elif edge == "right":
-            x, y = random.uniform(SCREEN_WIDTH, SCREEN_WIDTH + 50), random.uniform(0, SCREEN_HEIGHT)
+            x, y = rng.uniform(SCREEN_WIDTH, SCREEN_WIDTH + 50), rng.uniform(0, SCREEN_HEIGHT)
         elif edge == "top":
-            x, y = random.uniform(0, SCREEN_WIDTH), random.uniform(-50, 0)
+            x, y = rng.uniform(0, SCREEN_WIDTH), rng.uniform(-50, 0)
         else: # bottom
-            x, y = random.uniform(0, SCREEN_WIDTH), random.uniform(SCREEN_HEIGHT, SCREEN_HEIGHT + 50)
+            x, y = rng.uniform(0, SCREEN_WIDTH), rng.uniform(SCREEN_HEIGHT, SCREEN_HEIGHT + 50)
             
         # Give them random, controlled initial velocity
-        vx = random.uniform(-100, 100)
-        vy = random.uniform(-100, 100)
+        vx = rng.uniform(-100, 100)
+        vy = rng.uniform(-100, 100)
         
-        asteroids.append(Asteroid(x, y, vx, vy, size_level))
-        
-    return asteroids
+        asteroids.acquire(x, y, vx, vy, size_level)
 
 
-# --- Main Game Logic ---
-def main():
-    # --- Initialization ---
-    InitWindow(SCREEN_WIDTH, SCREEN_HEIGHT, "Raylib Asteroids Clone".encode('utf-8'))
-    SetTargetFPS(60)
+# --- Input Providers ---
 
-    # Game State Variables
-    ship = Ship(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-    bullets = []
-    asteroids = spawn_initial_asteroids(4, 3) # 4 large asteroids to start
-    game_state = "READY" # READY, PLAYING, GAME_OVER
+class KeyboardInput:
+    """Live input: raylib's frame time and the keyboard/mouse state packed into input bits."""
+    def next_frame(self):
+        buttons = 0
+        if IsKeyDown(KEY_LEFT) or IsKeyDown(KEY_A):
+            buttons |= INPUT_LEFT
+        if IsKeyDown(KEY_RIGHT) or IsKeyDown(KEY_D):
+            buttons |= INPUT_RIGHT
+        if IsKeyDown(KEY_UP) or IsKeyDown(KEY_W):
+            buttons |= INPUT_THRUST
+        if IsKeyPressed(KEY_SPACE) or IsMouseButtonPressed(MOUSE_BUTTON_LEFT):
+            buttons |= INPUT_FIRE
+        if IsKeyPressed(KEY_ENTER):
+            buttons |= INPUT_RESTART
+        return GetFrameTime(), buttons
+
+
+class BotInput:
+    """
+    Scripted player for soak runs, at a fixed frame time: turns toward the nearest
+    asteroid, fires once roughly lined up, thrusts now and then and restarts after
+    every game. Returns None after `frames` frames.
+    """
+    def __init__(self, game, frames, seed, delta_time=SOAK_DELTA_TIME):
+        self.game = game
+        self.frames = frames
+        self.frame = 0
+        self.rng = random.Random(seed)
+        self.delta_time = delta_time
+
+    def next_frame(self):
+        if self.frame >= self.frames:
+            return None
+        self.frame += 1
+        
+        game = self.game
+        if game.game_state == "READY":
+            return self.delta_time, INPUT_FIRE
+        if game.game_state != "PLAYING":
+            return self.delta_time, INPUT_RESTART
+        
+        buttons = INPUT_THRUST if self.rng.random() < 0.2 else 0
+        ship, store = game.ship, game.store
+        slots = game.asteroids.live_slots(store)
+        if len(slots):
+            dx, dy = wrapped_offset(ship.x, ship.y, store.x[slots], store.y[slots])
+            nearest = np.argmin(dx * dx + dy * dy)
+            # Bullets leave along (rotation - 90), see Ship.fire_bullet
+            target = math.degrees(math.atan2(dy[nearest], dx[nearest])) + 90
+            turn = (target - ship.rotation + 180) % 360 - 180
+            if turn < -5:
+                buttons |= INPUT_LEFT
+            elif turn > 5:
+                buttons |= INPUT_RIGHT
+            if abs(turn) < 15:
+                buttons |= INPUT_FIRE
+        return self.delta_time, buttons
+
+
+# --- Game State ---
+
+class Game:
+    """
+    All simulation state plus a `step` that advances it by one frame given that frame's
+    delta time and input bits. Gameplay randomness comes from one seeded RNG. While
+    playing, the time spent in each system is added to `timings` for soak reports.
+    """
+    SYSTEMS = ('update', 'collision', 'cleanup')
     
-    score = 0
-    total_points = sum(ASTEROID_SIZES[s][1] for s in ASTEROID_SIZES) * 4 # Max possible score
-
-    # --- Game Loop ---
-    while not WindowShouldClose():
-        delta_time = GetFrameTime()
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.store = AsteroidStore(1 + BULLET_POOL_SIZE + ASTEROID_POOL_SIZE)
+        self.ship = Ship(self.store, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.bullets = Pool(lambda: Bullet(self.store), BULLET_POOL_SIZE)
+        self.asteroids = Pool(lambda: Asteroid(self.store, self.rng), ASTEROID_POOL_SIZE)
+        spawn_initial_asteroids(self.asteroids, 4, 3, self.rng) # 4 large asteroids to start
+        self.asteroid_hash = ToroidalSpatialHash(SCREEN_WIDTH, SCREEN_HEIGHT, HASH_CELL_SIZE)
+        self.renderer = BatchRenderer() # GPU buffers are created by main once the window exists
         
-        # --- Update ---
-        if game_state == "READY":
-            if IsKeyPressed(KEY_SPACE) or IsMouseButtonPressed(MOUSE_BUTTON_LEFT):
-                game_state = "PLAYING"
+        self.game_state = "READY" # READY, PLAYING, GAME_OVER, WIN
+        self.score = 0
+        
+        self.timings = SystemTimings(self.SYSTEMS)
+
+    def restart(self):
+        # Soft reset the game state
+        self.ship.release()
+        self.ship = Ship(self.store, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        self.bullets.clear()
+        self.asteroids.clear()
+        spawn_initial_asteroids(self.asteroids, 4, 3, self.rng) 
+        self.score = 0
+        self.game_state = "READY"
+
+    def step(self, delta_time, buttons):
+        if self.game_state == "READY":
+            if buttons & INPUT_FIRE:
+                self.game_state = "PLAYING"
             
-        elif game_state == "PLAYING":
-            # Player Input
-            ship.update(delta_time)
+        elif self.game_state == "PLAYING":
+            timings = self.timings
+            timings.start()
+            self.update(delta_time, buttons)
+            timings.lap('update')
+            self.collide(delta_time)
+            timings.lap('collision')
+            self.cleanup()
+            timings.lap('cleanup')
+
+        elif self.game_state == "GAME_OVER" or self.game_state == "WIN":
+            if buttons & INPUT_RESTART:
+                self.restart()
+
+    def update(self, delta_time, buttons):
+        # Player Input
+        self.ship.update(delta_time, buttons)
+        
+        if buttons & INPUT_FIRE:
+            self.ship.fire_bullet(self.bullets)
+
+        # Move, wrap and age every entity at once
+        self.store.integrate(delta_time)
+        self.store.wrap(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.store.decay_lifetimes(delta_time)
+
+    def collide(self, delta_time):
+        ship, asteroids = self.ship, self.asteroids
+        
+        # All tests are swept over the frame's movement (v * delta_time, relative to the
+        # asteroid), so fast objects and long frames cannot tunnel through an asteroid
+        
+        # Broadphase: asteroids are stored with their radius grown by this frame's travel,
+        # and each mover queries the box around its whole path, so swept pairs are never
+        # missed. Fragments spawned below join asteroids.active but not the hash until next frame
+        asteroid_hash = self.asteroid_hash
+        asteroid_hash.clear()
+        for asteroid in asteroids.active:
+            if asteroid.is_active:
+                travel = math.hypot(asteroid.vx, asteroid.vy) * delta_time
+                asteroid_hash.insert(asteroid, asteroid.x, asteroid.y, asteroid.radius + travel)
+        
+        # 1. Ship vs Asteroid (swept bounding circles first, then the ship's triangle
+        # against the outline at points along the rest of the move)
+        if ship.is_active:
+            # Query around the midpoint of the ship's move this frame
+            half_x, half_y = ship.vx * delta_time / 2, ship.vy * delta_time / 2
+            reach = ship.radius + math.hypot(half_x, half_y)
             
-            if IsKeyPressed(KEY_SPACE) or IsMouseButtonPressed(MOUSE_BUTTON_LEFT):
-                new_bullet = ship.fire_bullet()
-                if new_bullet:
-                    bullets.append(new_bullet)
-
-            # Update Bullets
-            for bullet in bullets:
-                bullet.update(delta_time)
-
-            # Update Asteroids
-            for asteroid in asteroids:
-                asteroid.update(delta_time)
-                
-            # --- Collision Detection ---
+            # An asteroid spanning several cells is yielded once per cell; test it once
+            for asteroid in dict.fromkeys(asteroid_hash.query(ship.x - half_x, ship.y - half_y, reach)):
+                if asteroid.is_active and self.ship_hits(asteroid, delta_time):
+                    ship.lives -= 1
+                    if ship.lives <= 0:
+                        ship.is_active = False # Final death
+                        self.game_state = "GAME_OVER"
+                    else:
+                        # Simple respawn after hit
+                        ship.x, ship.y = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
+                        ship.vx, ship.vy = 0.0, 0.0
+                        # Destroy the impacting asteroid
+                        asteroid.is_active = False
+                        
+        # 2. Bullet vs Asteroid (each bullet only meets asteroids in its cells)
+        for bullet in self.bullets.active:
+            if not bullet.is_active: continue
             
-            # 1. Ship vs Asteroid
-            if ship.is_active:
-                for asteroid in asteroids:
-                    if CheckCollisionCircles((ship.x, ship.y), ship.radius, (asteroid.x, asteroid.y), asteroid.radius):
-                        ship.lives -= 1
-                        if ship.lives <= 0:
-                            ship.is_active = False # Final death
-                            game_state = "GAME_OVER"
-                        else:
-                            # Simple respawn after hit
-                            ship.x, ship.y = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
-                            ship.vx, ship.vy = 0.0, 0.0
-                            # Destroy the impacting asteroid
-                            asteroid.is_active = False
-                            
-            # 2. Bullet vs Asteroid
-            newly_spawned_asteroids = []
+            # Query around the midpoint of the bullet's move this frame
+            half_x, half_y = bullet.vx * delta_time / 2, bullet.vy * delta_time / 2
+            reach = bullet.radius + math.hypot(half_x, half_y)
             
-            for bullet in bullets:
-                if not bullet.is_active: continue
+            # A bullet can only hit one asteroid: the first one its path reaches
+            first_hit, first_toi = None, 2.0
+            for asteroid in dict.fromkeys(asteroid_hash.query(bullet.x - half_x, bullet.y - half_y, reach)):
+                if not asteroid.is_active: continue
                 
-                for asteroid in asteroids:
-                    if not asteroid.is_active: continue
+                toi = self.bullet_hit_time(bullet, asteroid, delta_time)
+                if toi is not None and toi < first_toi:
+                    first_hit, first_toi = asteroid, toi
                     
-                    if CheckCollisionCircles((bullet.x, bullet.y), bullet.radius, (asteroid.x, asteroid.y), asteroid.radius):
-                        bullet.is_active = False # Destroy bullet
-                        asteroid.is_active = False # Destroy asteroid
-                        score += ASTEROID_SIZES[asteroid.size_level][1] # Add score
-                        
-                        # Spawn smaller asteroids
-                        newly_spawned_asteroids.extend(Asteroid.create_small_asteroids(asteroid))
-                        break # Bullet can only hit one asteroid
-            
-            asteroids.extend(newly_spawned_asteroids)
-            
-            # --- Clean up inactive entities ---
-            bullets = [b for b in bullets if b.is_active]
-            asteroids = [a for a in asteroids if a.is_active]
-            
-            # Check for Win Condition (all asteroids destroyed)
-            if not asteroids and ship.is_active:
-                game_state = "WIN"
-
-
-        elif game_state == "GAME_OVER" or game_state == "WIN":
-            if IsKeyPressed(KEY_ENTER):
-                # Soft reset the game state
-                ship = Ship(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-                bullets = []
-                asteroids = spawn_initial_asteroids(4, 3) 
-                score = 0
-                game_state = "READY"
+            if first_hit is not None:
+                bullet.is_active = False # Destroy bullet
+                first_hit.is_active = False # Destroy asteroid
+                self.score += ASTEROID_SIZES[first_hit.size_level][1] # Add score
+                
+                # Spawn smaller asteroids
+                Asteroid.create_small_asteroids(first_hit, asteroids)
 
+    @staticmethod
+    def _relative_move(mover, asteroid, delta_time):
+        """The mover's start and end offsets from the asteroid over this frame."""
+        x1, y1 = wrapped_offset(asteroid.x, asteroid.y, mover.x, mover.y)
+        ddx = (mover.vx - asteroid.vx) * delta_time
+        ddy = (mover.vy - asteroid.vy) * delta_time
+        return x1 - ddx, y1 - ddy, x1, y1, ddx, ddy
+
+    def bullet_hit_time(self, bullet, asteroid, delta_time):
+        """Fraction of the frame at which the bullet reaches the asteroid's bounding circle, or None if it misses the outline."""
+        x0, y0, x1, y1, ddx, ddy = self._relative_move(bullet, asteroid, delta_time)
+        toi = swept_circles_toi(x0, y0, ddx, ddy, bullet.radius + asteroid.radius)
+        if toi is None or not swept_circle_hits_outline(x0, y0, x1, y1, bullet.radius, asteroid.shape):
+            return None
+        return toi
+
+    def ship_hits(self, asteroid, delta_time):
+        x0, y0, x1, y1, ddx, ddy = self._relative_move(self.ship, asteroid, delta_time)
+        toi = swept_circles_toi(x0, y0, ddx, ddy, self.ship.radius + asteroid.radius)
+        if toi is None:
+            return False
+        # Check the triangle at steps of at most half a ship size from first contact on
+        hull = self.ship.hull()
+        sectors = ASTEROID_SHAPES.sectors[asteroid.shape]
+        steps = max(1, math.ceil(math.hypot(ddx, ddy) * (1.0 - toi) / (SHIP_SIZE / 2)))
+        for k in range(steps + 1):
+            t = toi + (1.0 - toi) * k / steps
+            if triangle_hits_sectors(hull + (x0 + ddx * t, y0 + ddy * t), sectors):
+                return True
+        return False
+
+    def cleanup(self):
+        # --- Clean up inactive entities (in place, back into their pools) ---
+        self.bullets.release_inactive()
+        self.asteroids.release_inactive()
+        
+        # Check for Win Condition (all asteroids destroyed)
+        if not self.asteroids.active and self.ship.is_active:
+            self.game_state = "WIN"
 
-        # --- Draw ---
+    def draw(self):
+        ship, store, renderer, score = self.ship, self.store, self.renderer, self.score
+        
         BeginDrawing()
         ClearBackground(BLACK) 
         
+        # Entities are batched and submitted in one draw call
+        
         # Draw Ship (if active)
         if ship.is_active:
-            ship.draw()
+            ship.draw(renderer)
         
         # Draw Bullets
-        for bullet in bullets:
-            bullet.draw()
+        Bullet.draw_all(renderer, store, self.bullets.live_slots(store))
             
         # Draw Asteroids
-        for asteroid in asteroids:
-            asteroid.draw()
+        Asteroid.draw_all(renderer, store, self.asteroids.live_slots(store))
+        
+        renderer.flush()
         
         # Draw HUD
         score_text = f"Score: {score}".encode('utf-8')
@@ -339,7 +680,7 @@ def main():
 
 
         # Draw Game State Messages
-        if game_state == "READY":
+        if self.game_state == "READY":
             message_1 = "ASTEROIDS".encode('utf-8')
             message_2 = "Press SPACE to Begin | UP/W to Thrust".encode('utf-8')
             
@@ -348,7 +689,7 @@ def main():
             DrawText(message_2, SCREEN_WIDTH // 2 - MeasureText(message_2, 20) // 2, 
                      SCREEN_HEIGHT // 2, 20, GRAY)
 
-        elif game_state == "GAME_OVER":
+        elif self.game_state == "GAME_OVER":
             message_1 = "GAME OVER".encode('utf-8')
             message_2 = f"Final Score: {score}".encode('utf-8')
             message_3 = "Press ENTER to Restart".encode('utf-8')
@@ -360,7 +701,7 @@ def main():
             DrawText(message_3, SCREEN_WIDTH // 2 - MeasureText(message_3, 20) // 2, 
                      SCREEN_HEIGHT // 2 + 70, 20, GRAY)
                      
-        elif game_state == "WIN":
+        elif self.game_state == "WIN":
             message_1 = "WAVE CLEARED!".encode('utf-8')
             message_2 = f"Final Score: {score}".encode('utf-8')
             message_3 = "Press ENTER to Continue".encode('utf-8')
@@ -372,11 +713,49 @@ def main():
             DrawText(message_3, SCREEN_WIDTH // 2 - MeasureText(message_3, 20) // 2, 
                      SCREEN_HEIGHT // 2 + 70, 20, GRAY)
 
-
         EndDrawing()
 
+
+# --- Soak Testing ---
+
+def run_soak(frames, seed, delta_time=SOAK_DELTA_TIME):
+    """Plays `frames` frames headless with BotInput and a fixed seed and frame time."""
+    game = Game(seed)
+    play_headless(game, BotInput(game, frames, seed, delta_time), f"Soak: dt {delta_time:.4f}, seed {seed}",
+                  {"bullets": (lambda game: len(game.bullets.active), BULLET_POOL_SIZE),
+                   "asteroids": (lambda game: len(game.asteroids.active), ASTEROID_POOL_SIZE)})
+
+
+# --- Main Game Logic ---
+def main(seed=None):
+    # --- Initialization ---
+    InitWindow(SCREEN_WIDTH, SCREEN_HEIGHT, "Raylib Asteroids Clone".encode('utf-8'))
+    SetTargetFPS(60)
+
+    game = Game(seed)
+    game.renderer.load()
+    controls = KeyboardInput()
+    freeze_heap()
+
+    # --- Game Loop ---
+    while not WindowShouldClose():
+        game.step(*controls.next_frame())
+        game.draw()
+
     # --- De-Initialization ---
+    game.renderer.unload()
     CloseWindow()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Asteroids clone.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for every gameplay random draw (default: random)")
+    parser.add_argument("--soak", type=int, metavar="FRAMES",
+                        help="run FRAMES frames headless with a scripted bot and print timings")
+    parser.add_argument("--dt", type=float, default=SOAK_DELTA_TIME,
+                        help="fixed frame time for --soak (default: %(default).4f)")
+    args = parser.parse_args()
+    if args.soak:
+        run_soak(args.soak, 0 if args.seed is None else args.seed, args.dt)
+    else:
+        main(args.seed)
@@ -1,11 +1,26 @@
+import argparse
+import hashlib
+import json
+import os
 import random
 import math
+import numpy as np
 from raylib import *
 
+from shooter import (BatchRenderer, Entity, EntityStore, Pool, PooledEntity, SystemTimings, freeze_heap,
+                     play_headless)
+
 # --- Game Constants ---
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 SCROLL_SPEED = 200.0  # Speed of the starfield scroll (pixels/s)
+STAR_COUNT = 100      # Background stars, spread over the parallax layers
+# Parallax layers, far to near: (scroll speed factor, star radius, color)
+STAR_LAYERS = (
+    (0.6, 1, GRAY),
+    (0.9, 1, GRAY),
+    (1.3, 2, WHITE),
+)
 PLAYER_SPEED = 300.0
 PLAYER_RADIUS = 20
 PLAYER_FIRE_RATE = 0.2
@@ -15,86 +30,116 @@ ENEMY_SPEED = 150.0
 ENEMY_FIRE_RATE_MIN = 3.0
 ENEMY_FIRE_RATE_MAX = 6.0
 ENEMY_BULLET_SPEED = 400.0
+ENEMY_BULLET_RADIUS = 3
+ENEMY_HOVER_Y = 120.0    # 'hover' enemies stop descending here
 
-WAVE_TIMER_INTERVAL = 5.0 # Time between enemy waves
+WAVE_TIMER_INTERVAL = 5.0 # Time between enemy waves (unless the schedule overrides it)
+WAVE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "8.Shmup_waves.json")
+CULL_MARGIN = 100         # Entities this far off-screen are removed
 
-# --- Game Object Classes ---
+# Entity pool capacities (max alive at once; spawns beyond this are dropped)
+PLAYER_BULLET_POOL_SIZE = 32
+ENEMY_POOL_SIZE = 48
+ENEMY_BULLET_CAPACITY = 4096 # Enemy bullets live in a BulletField, not a pool
 
-class Star:
-    """Represents a single star in the scrolling background."""
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(0, SCREEN_HEIGHT)
-        self.size = random.uniform(1, 3)
-        self.color = GRAY if self.size < 2 else WHITE
-        
-    def update(self, delta_time):
-        # Move star downward, simulating upward flight
-        self.y += SCROLL_SPEED * delta_time * (self.size / 2) # Faster scroll for bigger stars (parallax effect)
-        
-        # Reset star to the top if it goes off-screen
-        if self.y > SCREEN_HEIGHT:
-            self.x = random.randint(0, SCREEN_WIDTH)
-            self.y = 0
+# Per-frame input bits: the whole of the player's influence on a frame, so a run can be
+# recorded as (delta_time, bits) pairs and replayed exactly
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+INPUT_FIRE = 16   # Fire/start pressed this frame
+INPUT_RESTART = 32 # Restart pressed this frame
 
-    def draw(self):
-        DrawCircle(int(self.x), int(self.y), int(self.size), self.color)
+SOAK_DELTA_TIME = 1 / 60 # Fixed frame time of a headless soak run
 
+# --- Game Object Classes ---
 
-class Entity:
-    """Base class for Ship, Bullet, and Enemy to handle movement and lifespan checks."""
-    def __init__(self, x, y, vx, vy, radius):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.radius = radius
-        self.is_active = True
+class StarField:
+    """
+    The scrolling background as a few pre-rendered layers, one per parallax depth. Each
+    layer's stars are baked once into a screen-sized RenderTexture that tiles vertically;
+    scrolling only moves the layer's texture offset, so the per-frame cost is one
+    textured quad per layer however many stars there are.
+    """
+    def __init__(self, count, layers=STAR_LAYERS):
+        rng = np.random.default_rng() # Visual only, so not part of the seeded game state
+        self.layers = []
+        for i, (speed, radius, color) in enumerate(layers):
+            # Spread the stars as evenly as possible over the layers
+            n = count // len(layers) + (i < count % len(layers))
+            x = rng.uniform(0, SCREEN_WIDTH, n)
+            y = rng.uniform(0, SCREEN_HEIGHT, n)
+            self.layers.append([SCROLL_SPEED * speed, radius, color, x, y])
+        self.offsets = np.zeros(len(layers)) # Scroll position of each layer, in pixels
+        self.textures = []
+
+    def load(self, renderer):
+        """Bakes every layer into its RenderTexture; needs the window's GL context."""
+        for speed, radius, color, x, y in self.layers:
+            texture = LoadRenderTexture(SCREEN_WIDTH, SCREEN_HEIGHT)
+            SetTextureWrap(texture.texture, TEXTURE_WRAP_REPEAT)
+            BeginTextureMode(texture)
+            ClearBackground(BLANK)
+            # Stars crossing the top or bottom edge are also drawn on the other side, so the layer tiles seamlessly
+            for shift in (-SCREEN_HEIGHT, 0, SCREEN_HEIGHT):
+                renderer.add_circles(x, y + shift, radius, color, segments=6)
+            renderer.flush()
+            EndTextureMode()
+            self.textures.append(texture)
+
+    def unload(self):
+        for texture in self.textures:
+            UnloadRenderTexture(texture)
+        self.textures = []
 
     def update(self, delta_time):
-        if not self.is_active:
-            return
-            
-        # Apply velocity to position
-        self.x += self.vx * delta_time
-        self.y += self.vy * delta_time
+        # Move the layers downward, simulating upward flight; nearer layers scroll faster
+        for i, layer in enumerate(self.layers):
+            self.offsets[i] = (self.offsets[i] + layer[0] * delta_time) % SCREEN_HEIGHT
+
+    def draw(self):
+        for texture, offset in zip(self.textures, self.offsets.tolist()):
+            # Negative source height flips the render texture upright; with repeat
+            # wrapping, shifting the source rectangle scrolls the layer down
+            DrawTexturePro(texture.texture, (0, offset, SCREEN_WIDTH, -SCREEN_HEIGHT),
+                           (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0), 0, WHITE)
 
-        # Check if entity is off-screen (for cleanup)
-        if self.x < -100 or self.x > SCREEN_WIDTH + 100 or \
-           self.y < -100 or self.y > SCREEN_HEIGHT + 100:
-            self.is_active = False
 
 class PlayerShip(Entity):
-    def __init__(self, x, y):
-        super().__init__(x, y, 0.0, 0.0, PLAYER_RADIUS)
+    __slots__ = ('can_fire_timer', 'lives')
+    
+    def __init__(self, store, x, y):
+        super().__init__(store, x, y, 0.0, 0.0, PLAYER_RADIUS)
         self.can_fire_timer = 0.0
         self.lives = 3
         
-    def update(self, delta_time):
+    def update(self, delta_time, buttons):
+        """Sets velocity from the frame's input bits; the store moves the ship, then clamp_to_screen runs."""
         # Handle player input and set velocity
         self.vx = 0.0
         self.vy = 0.0
         
-        if IsKeyDown(KEY_LEFT) or IsKeyDown(KEY_A):
+        if buttons & INPUT_LEFT:
             self.vx = -PLAYER_SPEED
-        if IsKeyDown(KEY_RIGHT) or IsKeyDown(KEY_D):
+        if buttons & INPUT_RIGHT:
             self.vx = PLAYER_SPEED
-        if IsKeyDown(KEY_UP) or IsKeyDown(KEY_W):
+        if buttons & INPUT_UP:
             self.vy = -PLAYER_SPEED
-        if IsKeyDown(KEY_DOWN) or IsKeyDown(KEY_S):
+        if buttons & INPUT_DOWN:
             self.vy = PLAYER_SPEED
 
-        super().update(delta_time)
-        
-        # Clamp position to screen bounds
-        self.x = max(self.radius, min(self.x, SCREEN_WIDTH - self.radius))
-        self.y = max(SCREEN_HEIGHT - 100 - self.radius, min(self.y, SCREEN_HEIGHT - self.radius))
-        
         # Update fire timer
         if self.can_fire_timer > 0:
             self.can_fire_timer -= delta_time
 
-    def fire_bullet(self):
+    def clamp_to_screen(self):
+        # Clamp position to screen bounds
+        self.x = max(self.radius, min(self.x, SCREEN_WIDTH - self.radius))
+        self.y = max(SCREEN_HEIGHT - 100 - self.radius, min(self.y, SCREEN_HEIGHT - self.radius))
+
+    def fire_bullet(self, player_bullets):
+        """Fires a bullet from the `player_bullets` pool if the fire timer allows it."""
         if self.can_fire_timer <= 0:
             # Bullet fires straight up
             start_x = self.x
@@ -102,34 +147,56 @@ class PlayerShip(Entity):
             
             self.can_fire_timer = PLAYER_FIRE_RATE
             # Player bullet always moves up (-Y direction)
-            return PlayerBullet(start_x, start_y, 0, -PLAYER_BULLET_SPEED) 
+            return player_bullets.acquire(start_x, start_y, 0, -PLAYER_BULLET_SPEED) 
 
-    def draw(self):
+    def draw(self, renderer):
         # Draw the ship as a blue triangle pointing up
-        p1 = (self.x, self.y - self.radius)
-        p2 = (self.x - self.radius, self.y + self.radius / 2)
-        p3 = (self.x + self.radius, self.y + self.radius / 2)
-        DrawTriangle(p1, p2, p3, BLUE)
+        x, y, r = self.x, self.y, self.radius
+        renderer.add_triangles(x, y - r, x - r, y + r / 2, x + r, y + r / 2, BLUE)
         # Add a light blue cockpit/canopy
-        DrawCircle(int(self.x), int(self.y), 5, SKYBLUE)
+        renderer.add_circles(x, y, 5, SKYBLUE)
         
-class PlayerBullet(Entity):
-    def __init__(self, x, y, vx, vy):
-        super().__init__(x, y, vx, vy, 4)
+class PlayerBullet(PooledEntity):
+    __slots__ = ()
+    
+    def __init__(self, store):
+        super().__init__(store, 4)
+
+    def spawn(self, x, y, vx, vy):
+        self.x, self.y = x, y
+        self.vx, self.vy = vx, vy
+        self.is_active = True
         
-    def draw(self):
-        if self.is_active:
-            DrawCircle(int(self.x), int(self.y), self.radius, LIME)
+    @staticmethod
+    def draw_all(renderer, store, slots):
+        renderer.add_circles(store.x[slots], store.y[slots], store.radius[slots], LIME, segments=8)
+
+class EnemyShip(PooledEntity):
+    __slots__ = ('rng', 'base_y', 'pattern', 'wave_time', 'fire_timer', 'points', 'emitter', 'emit_angle')
+    
+    def __init__(self, store, rng):
+        super().__init__(store)
+        self.rng = rng # The game's seeded RNG, so fire timings replay exactly
+        self.base_y = 0.0
+        self.pattern = 'straight'
+        self.wave_time = 0.0
+        self.fire_timer = 0.0
+        self.points = 100
+        self.emitter = SINGLE_SHOT
+        self.emit_angle = 0.0
 
-class EnemyShip(Entity):
-    def __init__(self, x, y, size, pattern='straight'):
-        super().__init__(x, y, 0, ENEMY_SPEED, size)
+    def spawn(self, x, y, size, pattern='straight', points=100, emitter=None):
+        self.x, self.y = x, y
+        self.vx, self.vy = 0, ENEMY_SPEED
         self.base_y = y # Used for sine wave calculation
         self.radius = size
         self.pattern = pattern
         self.wave_time = 0.0 # Tracks time within the current wave (used for patterns)
-        self.fire_timer = random.uniform(ENEMY_FIRE_RATE_MIN, ENEMY_FIRE_RATE_MAX)
-        self.points = 100
+        self.fire_timer = self.rng.uniform(ENEMY_FIRE_RATE_MIN, ENEMY_FIRE_RATE_MAX)
+        self.points = points
+        self.emitter = emitter or SINGLE_SHOT
+        self.emit_angle = 0.0 # Running angle for spiral emitters
+        self.is_active = True
         
     def update(self, delta_time):
         self.wave_time += delta_time
@@ -143,202 +210,551 @@ class EnemyShip(Entity):
             amplitude = 150.0
             frequency = 3.0 # How many full waves per second
             self.vx = amplitude * math.sin(frequency * self.wave_time)
-        
-        super().update(delta_time)
+        elif self.pattern == 'hover':
+            # Descend to a firing position and hold there
+            if self.y >= ENEMY_HOVER_Y:
+                self.vy = 0.0
         
         # Update fire timer
         self.fire_timer -= delta_time
 
-    def shoot(self):
+    def shoot(self, bullets, target_x, target_y):
+        """Fires a volley from this enemy's emitter into `bullets` when the fire timer runs out."""
         if self.fire_timer <= 0:
-            self.fire_timer = random.uniform(ENEMY_FIRE_RATE_MIN, ENEMY_FIRE_RATE_MAX)
-            # Enemy bullet always moves down (+Y direction)
-            return EnemyBullet(self.x, self.y + self.radius + 5, 0, ENEMY_BULLET_SPEED)
-        return None
-
-    def draw(self):
-        if self.is_active:
-            # Draw as a red/purple circle for distinction
-            DrawCircle(int(self.x), int(self.y), self.radius, RED)
-            # Simple wing line
-            DrawLine(int(self.x - self.radius), int(self.y), int(self.x + self.radius), int(self.y), PURPLE)
+            if self.emitter.interval is None:
+                self.fire_timer = self.rng.uniform(ENEMY_FIRE_RATE_MIN, ENEMY_FIRE_RATE_MAX)
+            else:
+                self.fire_timer += self.emitter.interval
+            self.emitter.fire(bullets, self, target_x, target_y)
+
+    @staticmethod
+    def draw_all(renderer, store, slots):
+        x, y, r = store.x[slots], store.y[slots], store.radius[slots]
+        # Draw as red circles for distinction
+        renderer.add_circles(x, y, r, RED, segments=20)
+        # Simple wing line
+        renderer.add_lines(x - r, y, x + r, y, PURPLE)
             
 
-class EnemyBullet(Entity):
-    def __init__(self, x, y, vx, vy):
-        super().__init__(x, y, vx, vy, 3)
-        
-    def draw(self):
-        if self.is_active:
-            DrawCircle(int(self.x), int(self.y), self.radius, ORANGE)
+class Emitter:
+    """
+    A bullet pattern, shared by every enemy of a type. Each volley fires `count` bullets
+    whose angles are fixed offsets around a base direction:
+      single    - one bullet straight down
+      radial    - a full ring
+      spiral    - `count` arms of a ring rotated by `turn` degrees every volley
+      aimed_fan - spread over `spread` degrees, centred on the player
+    `spin` (degrees/s) bends the trajectories; `interval` replaces the random fire delay.
+    """
+    def __init__(self, kind='single', count=1, speed=ENEMY_BULLET_SPEED, spread=0.0,
+                 turn=0.0, spin=0.0, interval=None):
+        self.kind = kind
+        self.speed = speed
+        self.turn = math.radians(turn)
+        self.spin = math.radians(spin)
+        self.interval = interval
+        if kind == 'single':
+            self.offsets = np.zeros(1)
+        elif kind in ('radial', 'spiral'):
+            self.offsets = np.linspace(0.0, 2 * math.pi, count, endpoint=False)
+        elif kind == 'aimed_fan':
+            half = math.radians(spread) / 2
+            self.offsets = np.linspace(-half, half, count) if count > 1 else np.zeros(1)
+        else:
+            raise ValueError(f"Unknown emitter kind: {kind}")
+        self.angles = np.empty_like(self.offsets) # Scratch for one volley
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**config) if config else SINGLE_SHOT
+
+    def fire(self, bullets, enemy, target_x, target_y):
+        x, y = enemy.x, enemy.y
+        if self.kind == 'single':
+            base = math.pi / 2 # Straight down in screen coordinates
+            y += enemy.radius + 5
+        elif self.kind == 'aimed_fan':
+            base = math.atan2(target_y - y, target_x - x)
+        else:
+            base = enemy.emit_angle
+            enemy.emit_angle += self.turn
+        np.add(self.offsets, base, out=self.angles)
+        bullets.emit(x, y, self.angles, self.speed, self.spin)
+
+
+SINGLE_SHOT = Emitter() # The original straight-down shot, used when a type has no emitter
+
+
+class BulletField:
+    """
+    Enemy bullets as parametric trajectories. A bullet is only its spawn point, angle,
+    speed, spin and spawn time; each frame every position is evaluated in one batch as
+        x = x0 + speed * age * cos(angle + spin * age)   (likewise y with sin)
+    instead of integrating bullets one by one. Live bullets are kept packed at the
+    front of the arrays, so every pass works on contiguous slices.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0       # Bullets in slots [0, count)
+        self.clock = 0.0     # Field time; ages are measured against it
+        self.origin_x = np.zeros(capacity)
+        self.origin_y = np.zeros(capacity)
+        self.angle = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.spin = np.zeros(capacity)
+        self.spawn_time = np.zeros(capacity)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+        # Scratch arrays reused every frame
+        self._age = np.zeros(capacity)
+        self._theta = np.zeros(capacity)
+        self._dist = np.zeros(capacity)
+
+    def emit(self, x, y, angles, speed, spin):
+        """Adds a volley of bullets starting at (x, y); bullets past capacity are dropped."""
+        start = self.count
+        end = min(start + len(angles), self.capacity)
+        n = end - start
+        self.origin_x[start:end] = x
+        self.origin_y[start:end] = y
+        self.angle[start:end] = angles[:n]
+        self.speed[start:end] = speed
+        self.spin[start:end] = spin
+        self.spawn_time[start:end] = self.clock
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.active[start:end] = True
+        self.count = end
+
+    def advance(self, delta_time):
+        """Moves the field clock forward and re-evaluates every bullet position."""
+        self.clock += delta_time
+        n = self.count
+        age, theta, dist = self._age[:n], self._theta[:n], self._dist[:n]
+        np.subtract(self.clock, self.spawn_time[:n], out=age)
+        np.multiply(self.spin[:n], age, out=theta)
+        theta += self.angle[:n]
+        np.multiply(self.speed[:n], age, out=dist)
+        x, y = self.x[:n], self.y[:n]
+        np.cos(theta, out=x)
+        x *= dist
+        x += self.origin_x[:n]
+        np.sin(theta, out=y)
+        y *= dist
+        y += self.origin_y[:n]
+
+    def cull(self, width, height, margin):
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        self.active[:n] &= (x >= -margin) & (x <= width + margin) & (y >= -margin) & (y <= height + margin)
+
+    def hit_test(self, x, y, radius):
+        """Deactivates every bullet overlapping the circle and returns how many there were."""
+        n = self.count
+        dx = self.x[:n] - x
+        dy = self.y[:n] - y
+        hits = (dx * dx + dy * dy <= (radius + ENEMY_BULLET_RADIUS) ** 2) & self.active[:n]
+        self.active[:n] &= ~hits
+        return int(np.count_nonzero(hits))
+
+    def compact(self):
+        """Packs the live bullets to the front of the arrays, keeping their order."""
+        n = self.count
+        live = self.active[:n]
+        kept = int(np.count_nonzero(live))
+        if kept == n:
+            return
+        for column in (self.origin_x, self.origin_y, self.angle, self.speed, self.spin,
+                       self.spawn_time, self.x, self.y):
+            column[:kept] = column[:n][live]
+        self.active[:kept] = True
+        self.active[kept:n] = False
+        self.count = kept
 
+    def clear(self):
+        self.active[:self.count] = False
+        self.count = 0
 
-# --- Game Management Functions ---
+    def draw(self, renderer):
+        n = self.count
+        renderer.add_circles(self.x[:n], self.y[:n], ENEMY_BULLET_RADIUS, ORANGE, segments=6)
 
-def spawn_wave(current_wave, enemies):
-    """Spawns a new wave of enemies."""
-    
-    if current_wave == 1:
-        # Wave 1: 5 straight-moving enemies
-        for i in range(5):
-            x_pos = SCREEN_WIDTH / 6 * (i + 1)
-            y_pos = -random.uniform(50, 150) # Start slightly off-screen
-            enemies.append(EnemyShip(x_pos, y_pos, 15, 'straight'))
-        print("Wave 1 spawned: Straight line.")
-        
-    elif current_wave == 2:
-        # Wave 2: 3 enemies with sine wave pattern
-        for i in range(3):
-            x_pos = SCREEN_WIDTH / 4 * (i + 1)
-            y_pos = -random.uniform(50, 150) 
-            enemies.append(EnemyShip(x_pos, y_pos, 20, 'sine'))
-        print("Wave 2 spawned: Sine pattern.")
-    
-    # You can add more complex waves here later!
 
+# --- Game Management Functions ---
 
-# --- Main Game Logic ---
-def main():
-    # --- Initialization ---
-    InitWindow(SCREEN_WIDTH, SCREEN_HEIGHT, "Raylib Vertical Shooter (Shmup)".encode('utf-8'))
-    SetTargetFPS(60)
+def load_wave_schedule(path):
+    """Reads the wave schedule (enemy types, waves and their spawn groups) from a JSON file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+class WaveDirector:
+    """
+    Runs a wave schedule. A wave starts once the field is clear and its `delay` has
+    passed; each of its spawn groups is then released `at` seconds into the wave, with
+    `count` enemies spread evenly across the group's `x` range at a random height in
+    its `y` range. With `loop` set, the schedule starts over after the last wave.
+    """
+    def __init__(self, schedule, rng):
+        self.enemy_types = schedule["enemy_types"]
+        self.emitters = {name: Emitter.from_config(enemy_type.get("emitter"))
+                         for name, enemy_type in self.enemy_types.items()}
+        self.waves = schedule["waves"]
+        self.interval = schedule.get("wave_interval", WAVE_TIMER_INTERVAL)
+        self.loop = schedule.get("loop", False)
+        self.rng = rng
+        self.current_wave = 0    # Number of the wave in progress (counts up across loops)
+        self.wave_name = ""
+        self.wave_clock = 0.0    # Seconds since the current wave started
+        self.pending = []        # Spawn groups of the current wave still to be released
+        self.timer = self._next_wave().get("delay", self.interval) if self.waves else 0.0
+
+    def _next_wave(self):
+        index = self.current_wave
+        if self.loop:
+            index %= len(self.waves)
+        return self.waves[index] if index < len(self.waves) else None
+
+    @property
+    def finished(self):
+        return self._next_wave() is None and not self.pending
+
+    def update(self, delta_time, enemies):
+        if self.pending:
+            self.wave_clock += delta_time
+            while self.pending and self.pending[0]["at"] <= self.wave_clock:
+                self._spawn_group(self.pending.pop(0), enemies)
+            return
 
-    # Game State Variables
-    ship = PlayerShip(SCREEN_WIDTH / 2, SCREEN_HEIGHT - 50)
-    stars = [Star() for _ in range(100)] # 100 stars for the background
-    
-    player_bullets = []
-    enemies = []
-    enemy_bullets = []
-    
-    game_state = "READY" # READY, PLAYING, GAME_OVER, WIN
+        # Count down to the next wave only while the field is clear
+        wave = self._next_wave()
+        if wave is None or enemies.active:
+            return
+        self.timer -= delta_time
+        if self.timer <= 0:
+            self.current_wave += 1
+            self.wave_name = wave.get("name", "")
+            self.wave_clock = 0.0
+            self.pending = sorted(wave["groups"], key=lambda group: group["at"])
+            following = self._next_wave()
+            self.timer = following.get("delay", self.interval) if following else 0.0
+            self.update(0.0, enemies) # Release the groups due at the start of the wave
+
+    def _spawn_group(self, group, enemies):
+        enemy_type = self.enemy_types[group["type"]]
+        x_start, x_end = group["x"]
+        y_min, y_max = group["y"]
+        count = group.get("count", 1)
+        for i in range(count):
+            x_pos = x_start + (x_end - x_start) * i / (count - 1) if count > 1 else x_start
+            y_pos = self.rng.uniform(y_min, y_max) # Start slightly off-screen
+            enemies.acquire(x_pos, y_pos, enemy_type["size"], group.get("pattern", 'straight'),
+                            enemy_type.get("points", 100), self.emitters[group["type"]])
+
+
+# --- Input Providers ---
+
+class KeyboardInput:
+    """Live input: raylib's frame time and the keyboard/mouse state packed into input bits."""
+    def next_frame(self):
+        buttons = 0
+        if IsKeyDown(KEY_LEFT) or IsKeyDown(KEY_A):
+            buttons |= INPUT_LEFT
+        if IsKeyDown(KEY_RIGHT) or IsKeyDown(KEY_D):
+            buttons |= INPUT_RIGHT
+        if IsKeyDown(KEY_UP) or IsKeyDown(KEY_W):
+            buttons |= INPUT_UP
+        if IsKeyDown(KEY_DOWN) or IsKeyDown(KEY_S):
+            buttons |= INPUT_DOWN
+        if IsKeyPressed(KEY_SPACE) or IsMouseButtonPressed(MOUSE_BUTTON_LEFT):
+            buttons |= INPUT_FIRE
+        if IsKeyPressed(KEY_ENTER):
+            buttons |= INPUT_RESTART
+        return GetFrameTime(), buttons
+
+    def close(self, fingerprint):
+        pass
+
+
+class InputRecorder:
+    """
+    Wraps another input provider and writes every frame it hands out to a recording.
+    The header holds the seed and the full wave schedule, so a replay does not depend
+    on the waves file staying the same; the footer holds the final state fingerprint.
+    """
+    def __init__(self, source, path, seed, schedule):
+        self.source = source
+        self.file = open(path, "w")
+        self.file.write(json.dumps({"seed": seed, "schedule": schedule}) + "\n")
+        self.frames = 0
+
+    def next_frame(self):
+        delta_time, buttons = self.source.next_frame()
+        # float.hex() round-trips the frame time exactly, which a decimal string may not
+        self.file.write(f"{float(delta_time).hex()} {buttons}\n")
+        self.frames += 1
+        return delta_time, buttons
+
+    def close(self, fingerprint):
+        self.source.close(fingerprint)
+        self.file.write(f"end {fingerprint}\n")
+        self.file.close()
+        print(f"Recorded {self.frames} frames, final state {fingerprint}")
+
+
+class ReplayInput:
+    """Plays a recording back frame by frame; next_frame returns None once it runs out."""
+    def __init__(self, path):
+        with open(path) as f:
+            header = json.loads(f.readline())
+            self.frames = []
+            self.expected = None
+            for line in f:
+                first, second = line.split()
+                if first == "end":
+                    self.expected = second
+                else:
+                    self.frames.append((float.fromhex(first), int(second)))
+        self.seed = header["seed"]
+        self.schedule = header["schedule"]
+        self.index = 0
+
+    def next_frame(self):
+        if self.index >= len(self.frames):
+            return None
+        self.index += 1
+        return self.frames[self.index - 1]
+
+    def close(self, fingerprint):
+        if self.index < len(self.frames):
+            print(f"Replay stopped at frame {self.index} of {len(self.frames)}")
+        elif self.expected is None:
+            print(f"Replayed {self.index} frames, final state {fingerprint} (recording has no end marker)")
+        elif fingerprint == self.expected:
+            print(f"Replayed {self.index} frames: final state matches the recording ({fingerprint})")
+        else:
+            print(f"Replay DIVERGED after {self.index} frames: {fingerprint} != {self.expected}")
+
+
+class BotInput:
+    """
+    Scripted player for soak runs, at a fixed frame time: sidesteps enemy bullets about
+    to reach the ship, otherwise lines up under the lowest enemy, fires whenever it can
+    and restarts after every game. Returns None after `frames` frames.
+    """
+    def __init__(self, game, frames, seed, delta_time=SOAK_DELTA_TIME):
+        self.game = game
+        self.frames = frames
+        self.frame = 0
+        self.rng = random.Random(seed)
+        self.delta_time = delta_time
+
+    def next_frame(self):
+        if self.frame >= self.frames:
+            return None
+        self.frame += 1
+        
+        game = self.game
+        if game.game_state == "READY":
+            return self.delta_time, INPUT_FIRE
+        if game.game_state != "PLAYING":
+            return self.delta_time, INPUT_RESTART
+        
+        buttons = INPUT_FIRE
+        ship, store, bullets = game.ship, game.store, game.enemy_bullets
+        dx = bullets.x[:bullets.count] - ship.x
+        dy = ship.y - bullets.y[:bullets.count]
+        threats = (np.abs(dx) < 3 * ship.radius) & (dy > 0) & (dy < 150)
+        if threats.any():
+            # Step away from the incoming bullets (or a random way if they are dead centre)
+            side = np.mean(dx[threats]) or self.rng.choice((-1, 1))
+            buttons |= INPUT_LEFT if side > 0 else INPUT_RIGHT
+        else:
+            slots = game.enemies.live_slots(store)
+            if len(slots):
+                target = store.x[slots[np.argmax(store.y[slots])]]
+                if target < ship.x - 5:
+                    buttons |= INPUT_LEFT
+                elif target > ship.x + 5:
+                    buttons |= INPUT_RIGHT
+        return self.delta_time, buttons
+
+
+# --- Game State ---
+
+class Game:
+    """
+    All simulation state plus a `step` that advances it by one frame given that frame's
+    delta time and input bits. Every random draw that affects gameplay comes from one
+    seeded RNG, so the same seed, schedule and frames always produce the same game.
+    While playing, the time spent in each system is added to `timings` for soak reports.
+    """
+    SYSTEMS = ('update', 'collision', 'cleanup')
     
-    score = 0
-    wave_timer = WAVE_TIMER_INTERVAL
-    current_wave = 0
-
-    # --- Game Loop ---
-    while not WindowShouldClose():
-        delta_time = GetFrameTime()
+    def __init__(self, schedule, seed, star_count=STAR_COUNT):
+        self.rng = random.Random(seed)
+        self.schedule = schedule
+        self.store = EntityStore(1 + PLAYER_BULLET_POOL_SIZE + ENEMY_POOL_SIZE)
+        self.ship = PlayerShip(self.store, SCREEN_WIDTH / 2, SCREEN_HEIGHT - 50)
+        self.stars = StarField(star_count) # Background (visual only)
+        self.renderer = BatchRenderer() # GPU buffers are created by main once the window exists
         
-        # --- Update ---
-        if game_state == "READY":
-            if IsKeyPressed(KEY_SPACE) or IsMouseButtonPressed(MOUSE_BUTTON_LEFT):
-                game_state = "PLAYING"
-                current_wave = 1
-                wave_timer = 1.0 # Give a moment before first wave
-            
-        elif game_state == "PLAYING":
-            
-            # 1. Background Scroll
-            for star in stars:
-                star.update(delta_time)
-                
-            # 2. Wave Management
-            if not enemies:
-                wave_timer -= delta_time
-                if wave_timer <= 0:
-                    spawn_wave(current_wave, enemies)
-                    current_wave += 1
-                    wave_timer = WAVE_TIMER_INTERVAL # Reset for next wave
-                    
-            # 3. Player Input & Update
-            ship.update(delta_time)
+        self.player_bullets = Pool(lambda: PlayerBullet(self.store), PLAYER_BULLET_POOL_SIZE)
+        self.enemies = Pool(lambda: EnemyShip(self.store, self.rng), ENEMY_POOL_SIZE)
+        self.enemy_bullets = BulletField(ENEMY_BULLET_CAPACITY)
+        self.director = WaveDirector(schedule, self.rng)
+        
+        self.game_state = "READY" # READY, PLAYING, GAME_OVER, WIN
+        self.score = 0
+        
+        self.timings = SystemTimings(self.SYSTEMS)
+
+    def restart(self):
+        # Back to the start of the schedule; the RNG carries on, so replays stay exact
+        self.ship.release()
+        self.ship = PlayerShip(self.store, SCREEN_WIDTH / 2, SCREEN_HEIGHT - 50)
+        self.player_bullets.clear()
+        self.enemies.clear()
+        self.enemy_bullets.clear()
+        self.director = WaveDirector(self.schedule, self.rng)
+        self.score = 0
+        self.game_state = "READY"
+
+    def step(self, delta_time, buttons):
+        if self.game_state == "READY":
+            if buttons & INPUT_FIRE:
+                self.game_state = "PLAYING"
             
-            if (IsKeyPressed(KEY_SPACE) or IsMouseButtonPressed(MOUSE_BUTTON_LEFT)) and ship.is_active:
-                new_bullet = ship.fire_bullet()
-                if new_bullet:
-                    player_bullets.append(new_bullet)
-
-            # 4. Enemy Update & Shooting
-            new_enemy_bullets = []
-            for enemy in enemies:
-                enemy.update(delta_time)
-                e_bullet = enemy.shoot()
-                if e_bullet:
-                    new_enemy_bullets.append(e_bullet)
-            enemy_bullets.extend(new_enemy_bullets)
+        elif self.game_state == "PLAYING":
+            timings = self.timings
+            timings.start()
+            self.update(delta_time, buttons)
+            timings.lap('update')
+            self.collide()
+            timings.lap('collision')
+            self.cleanup()
+            timings.lap('cleanup')
+
+        elif self.game_state == "GAME_OVER" or self.game_state == "WIN":
+            if buttons & INPUT_RESTART:
+                self.restart()
+
+    def update(self, delta_time, buttons):
+        ship = self.ship
+        
+        # 1. Background Scroll
+        self.stars.update(delta_time)
             
-            # 5. Bullet Updates
-            for bullet in player_bullets:
-                bullet.update(delta_time)
-            for bullet in enemy_bullets:
-                bullet.update(delta_time)
+        # 2. Wave Management
+        self.director.update(delta_time, self.enemies)
                 
-            # --- Collision Detection ---
+        # 3. Player Input & Update
+        ship.update(delta_time, buttons)
+        
+        if buttons & INPUT_FIRE and ship.is_active:
+            ship.fire_bullet(self.player_bullets)
+
+        # 4. Enemy Update & Shooting
+        for enemy in self.enemies.active:
+            enemy.update(delta_time)
+            enemy.shoot(self.enemy_bullets, ship.x, ship.y)
+        
+        # 5. Move, cull and age every entity at once
+        self.store.integrate(delta_time)
+        self.store.cull(SCREEN_WIDTH, SCREEN_HEIGHT, CULL_MARGIN)
+        self.store.decay_lifetimes(delta_time)
+        self.enemy_bullets.advance(delta_time)
+        self.enemy_bullets.cull(SCREEN_WIDTH, SCREEN_HEIGHT, CULL_MARGIN)
+        ship.clamp_to_screen()
+
+    def collide(self):
+        ship = self.ship
+        
+        # a. Player Bullet vs Enemy
+        for p_bullet in self.player_bullets.active:
+            if not p_bullet.is_active: continue
             
-            # a. Player Bullet vs Enemy
-            for p_bullet in player_bullets:
-                if not p_bullet.is_active: continue
+            for enemy in self.enemies.active:
+                if not enemy.is_active: continue
                 
-                for enemy in enemies:
-                    if not enemy.is_active: continue
+                if CheckCollisionCircles((p_bullet.x, p_bullet.y), p_bullet.radius, (enemy.x, enemy.y), enemy.radius):
+                    p_bullet.is_active = False # Destroy player bullet
+                    enemy.is_active = False # Destroy enemy
+                    self.score += enemy.points
+                    break # Bullet can only hit one entity
                     
-                    if CheckCollisionCircles((p_bullet.x, p_bullet.y), p_bullet.radius, (enemy.x, enemy.y), enemy.radius):
-                        p_bullet.is_active = False # Destroy player bullet
+        # b. Player vs Enemy Ship
+        if ship.is_active:
+            for enemy in self.enemies.active:
+                if enemy.is_active:
+                    if CheckCollisionCircles((ship.x, ship.y), ship.radius, (enemy.x, enemy.y), enemy.radius):
+                        ship.lives -= 1
                         enemy.is_active = False # Destroy enemy
-                        score += enemy.points
-                        break # Bullet can only hit one entity
-                        
-            # b. Player vs Enemy Ship
-            if ship.is_active:
-                for enemy in enemies:
-                    if enemy.is_active:
-                        if CheckCollisionCircles((ship.x, ship.y), ship.radius, (enemy.x, enemy.y), enemy.radius):
-                            ship.lives -= 1
-                            enemy.is_active = False # Destroy enemy
-                            if ship.lives <= 0:
-                                ship.is_active = False
-                                game_state = "GAME_OVER"
-                                
-            # c. Player vs Enemy Bullet
-            if ship.is_active:
-                for e_bullet in enemy_bullets:
-                    if e_bullet.is_active:
-                        if CheckCollisionCircles((ship.x, ship.y), ship.radius, (e_bullet.x, e_bullet.y), e_bullet.radius):
-                            ship.lives -= 1
-                            e_bullet.is_active = False # Destroy enemy bullet
-                            if ship.lives <= 0:
-                                ship.is_active = False
-                                game_state = "GAME_OVER"
-
-
-            # --- Clean up inactive entities ---
-            player_bullets = [b for b in player_bullets if b.is_active]
-            enemies = [e for e in enemies if e.is_active]
-            enemy_bullets = [b for b in enemy_bullets if b.is_active]
-            
-            # Note: No explicit WIN condition (waves are infinite or until you run out of waves)
-            # If current_wave > 2, you could add more waves or transition to a WIN state if no more waves exist.
-            
-        # --- Draw ---
+                        if ship.lives <= 0:
+                            ship.is_active = False
+                            self.game_state = "GAME_OVER"
+                            
+        # c. Player vs Enemy Bullet (one distance test over the whole field)
+        if ship.is_active:
+            hits = self.enemy_bullets.hit_test(ship.x, ship.y, ship.radius)
+            if hits:
+                ship.lives = max(ship.lives - hits, 0) # Each bullet costs a life
+                if ship.lives <= 0:
+                    ship.is_active = False
+                    self.game_state = "GAME_OVER"
+
+    def cleanup(self):
+        # --- Clean up inactive entities (in place, back into their pools) ---
+        self.player_bullets.release_inactive()
+        self.enemies.release_inactive()
+        self.enemy_bullets.compact()
+        
+        # A schedule without `loop` ends: clearing its last wave wins the game
+        if self.director.finished and not self.enemies.active and self.ship.is_active:
+            self.game_state = "WIN"
+
+    def fingerprint(self):
+        """Short hash of the simulation state, for checking that a replay matched."""
+        digest = hashlib.sha1()
+        bullets = self.enemy_bullets
+        for column in (self.store.x, self.store.y, self.store.vx, self.store.vy, self.store.active,
+                       bullets.x[:bullets.count], bullets.y[:bullets.count]):
+            digest.update(column.tobytes())
+        digest.update(f"{self.score} {self.ship.lives} {self.director.current_wave} {self.game_state}".encode())
+        return digest.hexdigest()[:16]
+
+    def draw(self):
+        ship = self.ship
+        
         BeginDrawing()
         ClearBackground(BLACK) 
         
-        # 1. Draw Stars (Background)
-        for star in stars:
-            star.draw()
+        # Entities are batched back to front and submitted in one draw call
+        renderer = self.renderer
+        
+        # 1. Draw Stars (Background, pre-rendered layers)
+        self.stars.draw()
             
         # 2. Draw Enemy Bullets
-        for bullet in enemy_bullets:
-            bullet.draw()
+        self.enemy_bullets.draw(renderer)
             
         # 3. Draw Enemies
-        for enemy in enemies:
-            enemy.draw()
+        EnemyShip.draw_all(renderer, self.store, self.enemies.live_slots(self.store))
             
         # 4. Draw Player Bullets
-        for bullet in player_bullets:
-            bullet.draw()
+        PlayerBullet.draw_all(renderer, self.store, self.player_bullets.live_slots(self.store))
             
         # 5. Draw Ship (if active)
         if ship.is_active:
-            ship.draw()
+            ship.draw(renderer)
+        
+        renderer.flush()
         
         # 6. Draw HUD
-        score_text = f"Score: {score}".encode('utf-8')
+        score_text = f"Score: {self.score}".encode('utf-8')
         lives_text = f"Lives: {ship.lives}".encode('utf-8')
-        wave_text = f"Wave: {current_wave}".encode('utf-8')
+        wave_text = f"Wave: {self.director.current_wave}  {self.director.wave_name}".encode('utf-8')
 
         DrawText(score_text, 10, 10, 20, WHITE)
         DrawText(lives_text, SCREEN_WIDTH - MeasureText(lives_text, 20) - 10, 10, 20, WHITE)
@@ -346,7 +762,7 @@ def main():
 
 
         # Draw Game State Messages
-        if game_state == "READY":
+        if self.game_state == "READY":
             message_1 = "VERTICAL SHOOTER".encode('utf-8')
             message_2 = "WASD/Arrows to Move | SPACE/Click to Shoot".encode('utf-8')
             
@@ -355,9 +771,9 @@ def main():
             DrawText(message_2, SCREEN_WIDTH // 2 - MeasureText(message_2, 20) // 2, 
                      SCREEN_HEIGHT // 2, 20, GRAY)
 
-        elif game_state == "GAME_OVER":
+        elif self.game_state == "GAME_OVER":
             message_1 = "GAME OVER".encode('utf-8')
-            message_2 = f"Final Score: {score}".encode('utf-8')
+            message_2 = f"Final Score: {self.score}".encode('utf-8')
             message_3 = "Press ENTER to Restart".encode('utf-8')
             
             DrawText(message_1, SCREEN_WIDTH // 2 - MeasureText(message_1, 60) // 2, 
@@ -367,10 +783,110 @@ def main():
             DrawText(message_3, SCREEN_WIDTH // 2 - MeasureText(message_3, 20) // 2, 
                      SCREEN_HEIGHT // 2 + 70, 20, GRAY)
 
+        elif self.game_state == "WIN":
+            message_1 = "ALL WAVES CLEARED".encode('utf-8')
+            message_2 = f"Final Score: {self.score}".encode('utf-8')
+            
+            DrawText(message_1, SCREEN_WIDTH // 2 - MeasureText(message_1, 50) // 2, 
+                     SCREEN_HEIGHT // 2 - 80, 50, LIME)
+            DrawText(message_2, SCREEN_WIDTH // 2 - MeasureText(message_2, 40) // 2, 
+                     SCREEN_HEIGHT // 2 + 10, 40, WHITE)
+
         EndDrawing()
 
+
+# --- Soak Testing ---
+
+# Pools reported by the soak and headless replay runs, as (count, capacity)
+PEAKS = {
+    "player bullets": (lambda game: len(game.player_bullets.active), PLAYER_BULLET_POOL_SIZE),
+    "enemies": (lambda game: len(game.enemies.active), ENEMY_POOL_SIZE),
+    "enemy bullets": (lambda game: game.enemy_bullets.count, ENEMY_BULLET_CAPACITY),
+}
+
+def outcome(game):
+    return f"last score {game.score}, wave {game.director.current_wave}"
+
+def run_soak(frames, seed, schedule, delta_time=SOAK_DELTA_TIME):
+    """Plays `frames` frames headless with BotInput and a fixed seed and frame time."""
+    game = Game(schedule, seed)
+    play_headless(game, BotInput(game, frames, seed, delta_time), f"Soak: dt {delta_time:.4f}, seed {seed}",
+                  PEAKS, outcome)
+
+def run_replay(path, star_count=STAR_COUNT):
+    """
+    Replays a recording headless and uncapped, so the same heavy wave can be profiled
+    over and over, then reports whether the final state matches the recording.
+    """
+    controls = ReplayInput(path)
+    game = Game(controls.schedule, controls.seed, star_count)
+    play_headless(game, controls, f"Replay {path}: seed {controls.seed}", PEAKS, outcome)
+    controls.close(game.fingerprint())
+
+
+# --- Main Game Logic ---
+def main(seed=None, wave_file=WAVE_FILE, record_path=None, replay_path=None, star_count=STAR_COUNT):
+    # --- Input and Schedule ---
+    if replay_path:
+        # A replay brings its own seed and schedule; only the recorded frames drive it
+        controls = ReplayInput(replay_path)
+        seed, schedule = controls.seed, controls.schedule
+    else:
+        if seed is None:
+            seed = random.randrange(2**32)
+        schedule = load_wave_schedule(wave_file)
+        controls = KeyboardInput()
+        if record_path:
+            controls = InputRecorder(controls, record_path, seed, schedule)
+
+    # --- Initialization ---
+    InitWindow(SCREEN_WIDTH, SCREEN_HEIGHT, "Raylib Vertical Shooter (Shmup)".encode('utf-8'))
+    SetTargetFPS(60)
+
+    game = Game(schedule, seed, star_count)
+    game.renderer.load()
+    game.stars.load(game.renderer)
+    freeze_heap()
+
+    # --- Game Loop ---
+    while not WindowShouldClose():
+        frame = controls.next_frame()
+        if frame is None:
+            break # Replay finished
+        
+        game.step(*frame)
+        game.draw()
+
     # --- De-Initialization ---
+    controls.close(game.fingerprint())
+    game.stars.unload()
+    game.renderer.unload()
     CloseWindow()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Vertical shooter with a data-driven wave schedule.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for every gameplay random draw (default: random)")
+    parser.add_argument("--waves", default=WAVE_FILE,
+                        help="JSON wave schedule to play (default: %(default)s)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record this run's seed, schedule and per-frame input to PATH")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recording instead of reading the keyboard")
+    parser.add_argument("--stars", type=int, default=STAR_COUNT,
+                        help="background star count; drawing cost does not depend on it (default: %(default)s)")
+    parser.add_argument("--soak", type=int, metavar="FRAMES",
+                        help="run FRAMES frames headless with a scripted bot and print timings")
+    parser.add_argument("--dt", type=float, default=SOAK_DELTA_TIME,
+                        help="fixed frame time for --soak (default: %(default).4f)")
+    parser.add_argument("--headless", action="store_true",
+                        help="with --replay: replay without a window, at full speed, and print timings")
+    args = parser.parse_args()
+    if args.headless and not args.replay:
+        parser.error("--headless needs --replay")
+    if args.soak:
+        run_soak(args.soak, 0 if args.seed is None else args.seed, load_wave_schedule(args.waves), args.dt)
+    elif args.headless:
+        run_replay(args.replay, args.stars)
+    else:
+        main(args.seed, args.waves, args.record, args.replay, args.stars)
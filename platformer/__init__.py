@@ -0,0 +1,18 @@
+"""
+Shared platformer engine for the 2D platformer demos (9, 10 and 11): a chunked,
+streamed tilemap with pre-rendered chunks, an endless seeded level generator, swept tile collision, the follow camera,
+the player/enemy/coin entities, and a fixed-step Game loop the demos configure,
+with input recording and headless replay.
+"""
+
+from .camera import FollowCamera, smooth_damp
+from .controls import INPUT_JUMP, INPUT_LEFT, INPUT_RIGHT, InputRecorder, KeyboardInput, ReplayInput
+from .entities import (ENEMY_SPEED, JUMP_VELOCITY, PLAYER_HEIGHT, PLAYER_SPEED, PLAYER_WIDTH,
+                       STOMP_BOUNCE, ChunkBuckets, CoinMap, Enemy, Player, draw_coins)
+from .generator import GeneratedLevel, generate_chunk
+from .game import (ACTIVE_MARGIN, FIXED_STEP, SCREEN_HEIGHT, SCREEN_WIDTH, Game, add_run_arguments,
+                   run, run_from_args, run_headless)
+from .physics import GRAVITY, MAX_FALL_SPEED, sweep_x, sweep_y
+from .tilemap import (CHUNK_PIXELS, CHUNK_TILES, MAX_BAKED_CHUNKS, TILE_AIR, TILE_COIN, TILE_ENEMY,
+                      TILE_SIZE, TILE_SOLID, ChunkedTilemap, StreamedLevel, chunk_range, encode_level,
+                      load_level)
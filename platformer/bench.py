@@ -0,0 +1,216 @@
+"""
+Tile-collision microbenchmarks: drives Player.update and Enemy.update headlessly over
+synthetic tilemaps of several sizes and densities, once per collision resolver, and
+reports tile checks per frame, time per update and peak memory growth per frame. Every
+candidate's trajectories are compared frame by frame against the current resolver's.
+
+    python -m platformer.bench [--frames N] [--seed S] [--quick]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from raylib import CheckCollisionRecs
+
+from .entities import Enemy, Player
+from .game import FIXED_STEP
+from .controls import INPUT_JUMP, INPUT_LEFT, INPUT_RIGHT
+from .physics import sweep_x, sweep_y
+from .tilemap import TILE_AIR, TILE_SIZE, TILE_SOLID, StreamedLevel, encode_level
+
+# (columns, rows, solid density) of the synthetic maps
+MAPS = [(64, 16, 0.05), (64, 16, 0.25), (1024, 16, 0.10), (1024, 32, 0.25), (8192, 16, 0.10)]
+QUICK_MAPS = MAPS[:3]
+ENEMIES_PER_COLUMNS = 8  # One enemy per this many columns of map
+TRACED_FRAMES = 200      # Frames traced for peak memory growth (tracemalloc is slow)
+TRAJECTORY_TOLERANCE = 1e-6
+
+
+# --- Legacy Resolver ---
+# The per-axis resolution demos 9-11 used before the swept resolver: move the whole
+# step, then push the box out of every solid tile it overlaps, one CheckCollisionRecs
+# call per tile. Kept as a candidate to measure against (it can tunnel at high speed).
+
+def legacy_x(level, x, y, width, height, dx):
+    x += dx
+    hit = False
+    for row in range(int(y / TILE_SIZE), int((y + height) / TILE_SIZE) + 1):
+        for col in range(int(x / TILE_SIZE), int((x + width) / TILE_SIZE) + 1):
+            if level.tile(col, row) == TILE_SOLID and CheckCollisionRecs(
+                    (x, y, width, height), (col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)):
+                if dx > 0:
+                    x = col * TILE_SIZE - width
+                elif dx < 0:
+                    x = col * TILE_SIZE + TILE_SIZE
+                hit = True
+    return x, hit
+
+def legacy_y(level, x, y, width, height, dy):
+    y += dy
+    hit = False
+    for row in range(int(y / TILE_SIZE), int((y + height) / TILE_SIZE) + 1):
+        for col in range(int(x / TILE_SIZE), int((x + width) / TILE_SIZE) + 1):
+            if level.tile(col, row) == TILE_SOLID and CheckCollisionRecs(
+                    (x, y, width, height), (col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)):
+                if dy >= 0:
+                    y = row * TILE_SIZE - height
+                else:
+                    y = row * TILE_SIZE + TILE_SIZE
+                hit = True
+    return y, hit
+
+
+# Candidate resolvers as (sweep_x, sweep_y); the first is the reference
+RESOLVERS = {
+    "swept": (sweep_x, sweep_y),
+    "legacy": (legacy_x, legacy_y),
+}
+
+
+class CountingLevel:
+    """Wraps a level and counts tile lookups, i.e. collision checks."""
+    def __init__(self, level):
+        self.level = level
+        self.checks = 0
+
+    def tile(self, col, row):
+        self.checks += 1
+        return self.level.tile(col, row)
+
+    def __getattr__(self, name):
+        return getattr(self.level, name)
+
+
+def synthetic_level(cols, rows, density, rng):
+    """A walled, floored map with solid tiles scattered at `density`, and a clear spawn corner."""
+    level = [[TILE_AIR] * cols for _ in range(rows)]
+    for row in range(rows):
+        for col in range(cols):
+            if row == rows - 1 or col == 0 or col == cols - 1 or rng.random() < density:
+                level[row][col] = TILE_SOLID
+    for row in range(1, 5):
+        for col in range(1, 5):
+            level[row][col] = TILE_AIR
+    return level
+
+def spawn_points(level, count, rng):
+    """Picks `count` air tiles (top-left pixel positions) for enemies."""
+    rows, cols = len(level), len(level[0])
+    points = []
+    while len(points) < count:
+        col, row = rng.randrange(1, cols - 1), rng.randrange(0, rows - 1)
+        if level[row][col] == TILE_AIR:
+            points.append((col * TILE_SIZE, row * TILE_SIZE))
+    return points
+
+def scripted_inputs(frames, rng):
+    """Per-frame input bits: runs of left/right held for a while, with occasional jumps."""
+    inputs = []
+    held = INPUT_RIGHT
+    for _ in range(frames):
+        if rng.random() < 0.01:
+            held = INPUT_LEFT if held == INPUT_RIGHT else INPUT_RIGHT
+        inputs.append(held | (INPUT_JUMP if rng.random() < 0.03 else 0))
+    return inputs
+
+
+def decoded_level(tiles):
+    """Packs the map and decodes every chunk up front, so lazy decoding stays out of the numbers."""
+    level = StreamedLevel(encode_level(tiles))
+    level.stream((0, level.cols - 1, 0, level.rows - 1))
+    return level
+
+
+def simulate(level, resolver, spawns, inputs, counting=False, tracing=False):
+    """
+    Runs one player and the enemies over `inputs` with the given resolver. Returns
+    (trajectory, update seconds, tile checks, summed peak growth of the traced frames).
+    A frame's peak growth is how far traced memory rose above its level at the start of
+    the frame: the frame's transient working set, not the total bytes it allocated
+    (tracemalloc cannot count those; memory freed and reused within a frame counts once).
+    """
+    player_class = type("BenchPlayer", (Player,), {"sweep_x": staticmethod(resolver[0]),
+                                                   "sweep_y": staticmethod(resolver[1])})
+    enemy_class = type("BenchEnemy", (Enemy,), {"sweep_x": staticmethod(resolver[0]),
+                                                "sweep_y": staticmethod(resolver[1])})
+    if counting:
+        level = CountingLevel(level)
+    player = player_class(TILE_SIZE * 2, TILE_SIZE * 2)
+    enemies = [enemy_class(x, y) for x, y in spawns]
+
+    trajectory = []
+    peak_growth = 0
+    elapsed = 0.0
+    for buttons in inputs:
+        if tracing:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        player.update(FIXED_STEP, level, buttons)
+        for enemy in enemies:
+            enemy.update(FIXED_STEP, level)
+        elapsed += time.perf_counter() - start
+        if tracing:
+            peak_growth += tracemalloc.get_traced_memory()[1] - before
+        else:
+            trajectory.append((player.x, player.y, *[v for enemy in enemies for v in (enemy.x, enemy.y)]))
+    return trajectory, elapsed, level.checks if counting else 0, peak_growth
+
+def compare(reference, trajectory):
+    """Returns None if the trajectories match, else (first diverging frame, largest deviation)."""
+    first = None
+    worst = 0.0
+    for frame, (expected, actual) in enumerate(zip(reference, trajectory)):
+        deviation = max(abs(a - b) for a, b in zip(expected, actual))
+        if deviation > TRAJECTORY_TOLERANCE:
+            worst = max(worst, deviation)
+            if first is None:
+                first = frame
+    return None if first is None else (first, worst)
+
+
+def run_suite(frames, seed, maps):
+    print(f"{frames} frames per run at {FIXED_STEP * 1000:.2f} ms steps, seed {seed}\n")
+    print(f"{'map':<18} {'resolver':<8} {'checks/frame':>12} {'us/update':>10} {'peak B/frame':>13}  trajectory")
+    for cols, rows, density in maps:
+        rng = random.Random(f"{seed}:{cols}x{rows}:{density}")
+        tiles = synthetic_level(cols, rows, density, rng)
+        spawns = spawn_points(tiles, max(1, cols // ENEMIES_PER_COLUMNS), rng)
+        inputs = scripted_inputs(frames, rng)
+        updates = frames * (1 + len(spawns))
+
+        reference = None
+        for name, resolver in RESOLVERS.items():
+            # Separate passes, so counting and tracing don't skew the timing
+            trajectory, elapsed, _, _ = simulate(decoded_level(tiles), resolver, spawns, inputs)
+            _, _, checks, _ = simulate(decoded_level(tiles), resolver, spawns, inputs, counting=True)
+            tracemalloc.start()
+            _, _, _, peak_growth = simulate(decoded_level(tiles), resolver, spawns,
+                                            inputs[:TRACED_FRAMES], tracing=True)
+            tracemalloc.stop()
+
+            if reference is None:
+                reference = trajectory
+                verdict = "reference"
+            else:
+                divergence = compare(reference, trajectory)
+                if divergence is None:
+                    verdict = "identical"
+                else:
+                    verdict = f"DIVERGES at frame {divergence[0]} (max {divergence[1]:.2f}px)"
+
+            label = f"{cols}x{rows} d={density:.2f}"
+            print(f"{label:<18} {name:<8} {checks / frames:>12.1f} {elapsed / updates * 1e6:>10.2f} "
+                  f"{peak_growth / min(frames, TRACED_FRAMES):>13.0f}  {verdict}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tile-collision microbenchmarks for the platformer entities.")
+    parser.add_argument("--frames", type=int, default=1200,
+                        help="physics steps per run (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for maps, enemy spawns and inputs (default: %(default)s)")
+    parser.add_argument("--quick", action="store_true",
+                        help="only the small maps")
+    args = parser.parse_args()
+    run_suite(args.frames, args.seed, QUICK_MAPS if args.quick else MAPS)
@@ -0,0 +1,105 @@
+import math
+from pyray import Camera2D, Vector2
+
+from .tilemap import TILE_SIZE
+
+# --- Camera Constants ---
+CAMERA_DEAD_ZONE_WIDTH = TILE_SIZE * 2   # The player moves this freely before the camera follows
+CAMERA_DEAD_ZONE_HEIGHT = TILE_SIZE * 3
+CAMERA_SMOOTH_TIME = 0.15                # Seconds the camera roughly takes to catch up
+LOOK_AHEAD_DISTANCE = TILE_SIZE * 3      # How far the camera leads the player's facing direction
+LOOK_AHEAD_SMOOTH_TIME = 0.5
+
+
+def smooth_damp(current, target, velocity, smooth_time, delta_time):
+    """
+    Moves `current` towards `target` like a critically damped spring (no overshoot),
+    using the usual polynomial approximation of exp(-omega * dt). Returns (value, velocity).
+    """
+    omega = 2.0 / smooth_time
+    x = omega * delta_time
+    decay = 1.0 / (1.0 + x + 0.48 * x * x + 0.235 * x * x * x)
+    change = current - target
+    temp = (velocity + omega * change) * delta_time
+    velocity = (velocity - omega * temp) * decay
+    return target + (change + temp) * decay, velocity
+
+
+class FollowCamera:
+    """
+    Follows the player with a dead zone, critically damped smoothing and look-ahead in
+    the direction the player is facing, clamped to the world. After each update it
+    publishes what it shows: `view`, the world rect (left, top, right, bottom), and
+    `tiles`, the visible tile rect (first_col, last_col, first_row, last_row). The
+    renderer, streaming, enemy activation and culling all read these instead of
+    working out visibility themselves.
+    """
+    def __init__(self, screen_width, screen_height, world_width, world_height, x, y):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.last_col = math.ceil(world_width / TILE_SIZE) - 1
+        self.last_row = math.ceil(world_height / TILE_SIZE) - 1
+
+        # World clamps for the camera target, fixed for the level's lifetime
+        self.min_x = screen_width / 2
+        self.max_x = max(self.min_x, world_width - screen_width / 2)
+        self.min_y = screen_height / 2
+        self.max_y = max(self.min_y, world_height - screen_height / 2)
+
+        # The raylib camera handed to BeginMode2D
+        self.camera = Camera2D()
+        self.camera.offset = Vector2(screen_width / 2, screen_height / 2) # Screen position the target is drawn at (center)
+        self.camera.rotation = 0.0
+        self.camera.zoom = 1.0
+
+        self.focus_x, self.focus_y = x, y  # Center of the dead zone
+        self.look_ahead = 0.0
+        self.look_ahead_goal = 0.0
+        self.look_ahead_velocity = 0.0
+        self.velocity_x = 0.0
+        self.velocity_y = 0.0
+        self.snap_to(x, y)
+
+    def snap_to(self, x, y):
+        """Looks straight at (x, y), with no smoothing."""
+        self.x = min(max(x, self.min_x), self.max_x)
+        self.y = min(max(y, self.min_y), self.max_y)
+        self.velocity_x = self.velocity_y = 0.0
+        self.publish()
+
+    def update(self, delta_time, player):
+        center_x = player.x + player.width / 2
+        center_y = player.y + player.height / 2
+
+        # Dead zone: the focus only moves when the player pushes against its edges
+        half_width = CAMERA_DEAD_ZONE_WIDTH / 2
+        half_height = CAMERA_DEAD_ZONE_HEIGHT / 2
+        self.focus_x = min(max(self.focus_x, center_x - half_width), center_x + half_width)
+        self.focus_y = min(max(self.focus_y, center_y - half_height), center_y + half_height)
+
+        # Look-ahead: lead the direction the player last moved in
+        if player.vx > 0:
+            self.look_ahead_goal = LOOK_AHEAD_DISTANCE
+        elif player.vx < 0:
+            self.look_ahead_goal = -LOOK_AHEAD_DISTANCE
+        self.look_ahead, self.look_ahead_velocity = smooth_damp(
+            self.look_ahead, self.look_ahead_goal, self.look_ahead_velocity, LOOK_AHEAD_SMOOTH_TIME, delta_time)
+
+        goal_x = min(max(self.focus_x + self.look_ahead, self.min_x), self.max_x)
+        goal_y = min(max(self.focus_y, self.min_y), self.max_y)
+        self.x, self.velocity_x = smooth_damp(self.x, goal_x, self.velocity_x, CAMERA_SMOOTH_TIME, delta_time)
+        self.y, self.velocity_y = smooth_damp(self.y, goal_y, self.velocity_y, CAMERA_SMOOTH_TIME, delta_time)
+        self.x = min(max(self.x, self.min_x), self.max_x)
+        self.y = min(max(self.y, self.min_y), self.max_y)
+        self.publish()
+
+    def publish(self):
+        """Updates the raylib camera and the visible world/tile rects."""
+        self.camera.target = Vector2(self.x, self.y)
+        left = self.x - self.screen_width / 2
+        top = self.y - self.screen_height / 2
+        right = left + self.screen_width
+        bottom = top + self.screen_height
+        self.view = (left, top, right, bottom)
+        self.tiles = (max(0, int(left // TILE_SIZE)), min(self.last_col, int(right // TILE_SIZE)),
+                      max(0, int(top // TILE_SIZE)), min(self.last_row, int(bottom // TILE_SIZE)))
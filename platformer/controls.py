@@ -0,0 +1,103 @@
+import json
+from raylib import *
+
+# Per-step input bits: the whole of the player's influence on a physics step, so a run
+# can be recorded as one number per step and replayed exactly
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4          # Set on the first step after the jump key was pressed
+
+
+class KeyboardInput:
+    """
+    Live input. poll() reads the keyboard once per rendered frame; next_step() hands out
+    the bits for one physics step. A jump press is held until a step consumes it, so it
+    is neither lost on a frame that runs no steps nor repeated on one that runs several.
+    """
+    def __init__(self):
+        self.held = 0
+        self.jump_pending = False
+
+    def poll(self):
+        self.held = 0
+        if IsKeyDown(KEY_LEFT) or IsKeyDown(KEY_A):
+            self.held |= INPUT_LEFT
+        if IsKeyDown(KEY_RIGHT) or IsKeyDown(KEY_D):
+            self.held |= INPUT_RIGHT
+        if IsKeyPressed(KEY_SPACE) or IsKeyPressed(KEY_UP):
+            self.jump_pending = True
+
+    def next_step(self):
+        buttons = self.held
+        if self.jump_pending:
+            buttons |= INPUT_JUMP
+            self.jump_pending = False
+        return buttons
+
+    def close(self, fingerprint):
+        pass
+
+
+class InputRecorder:
+    """
+    Wraps another input provider and writes every step it hands out to a recording.
+    The header holds the step length and the level checksum; the footer holds the
+    final state fingerprint, which a replay compares against.
+    """
+    def __init__(self, source, path, step_time, level_checksum):
+        self.source = source
+        self.file = open(path, "w")
+        # float.hex() round-trips the step length exactly, which a decimal string may not
+        self.file.write(json.dumps({"step": float(step_time).hex(), "level": level_checksum}) + "\n")
+        self.steps = 0
+
+    def poll(self):
+        self.source.poll()
+
+    def next_step(self):
+        buttons = self.source.next_step()
+        self.file.write(f"{buttons}\n")
+        self.steps += 1
+        return buttons
+
+    def close(self, fingerprint):
+        self.source.close(fingerprint)
+        self.file.write(f"end {fingerprint}\n")
+        self.file.close()
+        print(f"Recorded {self.steps} steps, final state {fingerprint}")
+
+
+class ReplayInput:
+    """Plays a recording back step by step; next_step returns None once it runs out."""
+    def __init__(self, path):
+        with open(path) as f:
+            header = json.loads(f.readline())
+            self.steps = []
+            self.expected = None
+            for line in f:
+                if line.startswith("end "):
+                    self.expected = line.split()[1]
+                else:
+                    self.steps.append(int(line))
+        self.step_time = float.fromhex(header["step"])
+        self.level_checksum = header["level"]
+        self.index = 0
+
+    def poll(self):
+        pass
+
+    def next_step(self):
+        if self.index >= len(self.steps):
+            return None
+        self.index += 1
+        return self.steps[self.index - 1]
+
+    def close(self, fingerprint):
+        if self.index < len(self.steps):
+            print(f"Replay stopped at step {self.index} of {len(self.steps)}")
+        elif self.expected is None:
+            print(f"Replayed {self.index} steps, final state {fingerprint} (recording has no end marker)")
+        elif fingerprint == self.expected:
+            print(f"Replayed {self.index} steps: final state matches the recording ({fingerprint})")
+        else:
+            print(f"Replay DIVERGED after {self.index} steps: {fingerprint} != {self.expected}")
@@ -0,0 +1,325 @@
+from raylib import *
+from pyray import Vector2
+
+from .controls import INPUT_JUMP, INPUT_LEFT, INPUT_RIGHT
+from .physics import GRAVITY, MAX_FALL_SPEED, _tile_span, sweep_x, sweep_y
+from .tilemap import CHUNK_PIXELS, CHUNK_TILES, TILE_SIZE
+
+# --- Entity Constants ---
+JUMP_VELOCITY = -750.0  # Initial upward velocity on jump
+STOMP_BOUNCE = JUMP_VELOCITY * 0.6 # Reduced jump velocity for bounce
+PLAYER_SPEED = 300.0    # Player horizontal movement speed
+ENEMY_SPEED = 100.0     # Enemy horizontal movement speed
+PLAYER_WIDTH = TILE_SIZE * 0.8
+PLAYER_HEIGHT = TILE_SIZE * 0.9
+COIN_COLLISION_SIZE = TILE_SIZE * 0.5 # Coin pickup box, centered in its tile
+
+
+class ChunkBuckets:
+    """
+    Entities bucketed by the chunk column their left edge falls in. Per-frame work can
+    then be limited to the columns around the camera, and player queries only look at
+    the buckets next to the player, however long the level is.
+    """
+    def __init__(self):
+        self.buckets = {} # chunk column -> list of entities
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, x, item):
+        self.buckets.setdefault(int(x // CHUNK_PIXELS), []).append(item)
+        self.count += 1
+
+    def remove(self, x, item):
+        column = int(x // CHUNK_PIXELS)
+        bucket = self.buckets[column]
+        bucket.remove(item)
+        if not bucket:
+            del self.buckets[column]
+        self.count -= 1
+
+    def move(self, old_x, new_x, item):
+        """Re-buckets an entity that moved from old_x to new_x, if it changed column."""
+        if int(old_x // CHUNK_PIXELS) != int(new_x // CHUNK_PIXELS):
+            self.remove(old_x, item)
+            self.add(new_x, item)
+
+    def drop_origin(self, column):
+        """
+        Forgets every entity that spawned in a chunk column, wherever it has walked
+        since: the column's chunk was evicted and spawns them again when regenerated.
+        """
+        for key in list(self.buckets):
+            bucket = self.buckets[key]
+            kept = [item for item in bucket if item.origin != column]
+            if len(kept) != len(bucket):
+                self.count -= len(bucket) - len(kept)
+                if kept:
+                    self.buckets[key] = kept
+                else:
+                    del self.buckets[key]
+
+    def in_columns(self, first_col, last_col):
+        """
+        Returns the entities in chunk columns first_col..last_col, as a new list so the
+        buckets can be changed while iterating it.
+        """
+        items = []
+        for column in range(first_col, last_col + 1):
+            items.extend(self.buckets.get(column, ()))
+        return items
+
+    def near(self, left, right):
+        """Returns the entities that may overlap the x range [left, right] (entities are at most a tile wide)."""
+        return self.in_columns(int((left - TILE_SIZE) // CHUNK_PIXELS), int(right // CHUNK_PIXELS))
+
+
+class CoinMap:
+    """
+    Coins keyed by the (col, row) of the tile they sit in. A coin's pickup box lies
+    inside its tile, so only the handful of tiles a box overlaps can hold coins it
+    touches: collection is a few dict lookups and removal is a single delete, however
+    many coins the level has.
+    """
+    def __init__(self):
+        self.coins = {} # (col, row) -> coin center (x, y)
+
+    def __len__(self):
+        return len(self.coins)
+
+    def add(self, col, row):
+        self.coins[(col, row)] = ((col + 0.5) * TILE_SIZE, (row + 0.5) * TILE_SIZE)
+
+    def remove(self, key):
+        del self.coins[key]
+
+    def drop_chunk(self, chunk_col, chunk_row):
+        """Forgets every coin in a chunk (it was evicted)."""
+        first_col, first_row = chunk_col * CHUNK_TILES, chunk_row * CHUNK_TILES
+        for row in range(first_row, first_row + CHUNK_TILES):
+            for col in range(first_col, first_col + CHUNK_TILES):
+                self.coins.pop((col, row), None)
+
+    def touching(self, x, y, width, height):
+        """Returns the keys of the coins whose pickup box overlaps the box (x, y, width, height)."""
+        first_col, last_col = _tile_span(x, width)
+        first_row, last_row = _tile_span(y, height)
+        half = COIN_COLLISION_SIZE / 2
+        keys = []
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                center = self.coins.get((col, row))
+                if center is None:
+                    continue
+                cx, cy = center
+                if x < cx + half and x + width > cx - half and y < cy + half and y + height > cy - half:
+                    keys.append((col, row))
+        return keys
+
+    def in_tiles(self, first_col, last_col, first_row, last_row):
+        """Returns the centers of the coins inside a tile rect (e.g. the visible tiles)."""
+        area = (last_col - first_col + 1) * (last_row - first_row + 1)
+        if len(self.coins) < area:
+            # Sparse: cheaper to filter the coins than to probe every tile
+            return [center for (col, row), center in self.coins.items()
+                    if first_col <= col <= last_col and first_row <= row <= last_row]
+        coins = self.coins
+        return [coins[(col, row)] for row in range(first_row, last_row + 1)
+                for col in range(first_col, last_col + 1) if (col, row) in coins]
+
+
+# --- Game Object Classes ---
+
+class Player:
+    # Tile collision resolver (platformer.bench swaps in other implementations to compare them)
+    sweep_x = staticmethod(sweep_x)
+    sweep_y = staticmethod(sweep_y)
+
+    def __init__(self, x, y, color=BLUE):
+        # Store starting position for reset
+        self.start_x = x
+        self.start_y = y
+        # Current position (top-left for collision)
+        self.x = x
+        self.y = y
+        self.width = PLAYER_WIDTH
+        self.height = PLAYER_HEIGHT
+        self.color = color
+
+        # Physics
+        self.vx = 0.0
+        self.vy = 0.0
+        self.is_grounded = False
+
+    def get_rect(self):
+        """Returns the player's collision bounding box (top-left, width, height)."""
+        return (self.x, self.y, self.width, self.height)
+
+    def update(self, delta_time, level, buttons):
+        # 1. Handle Input (Horizontal Movement)
+        self.vx = 0.0
+        if buttons & INPUT_LEFT:
+            self.vx = -PLAYER_SPEED
+        if buttons & INPUT_RIGHT:
+            self.vx = PLAYER_SPEED
+
+        # --- Velocity Zeroing for Stability ---
+        if self.is_grounded:
+            self.vy = 0.0
+
+        # 2. Handle Input (Jump)
+        if buttons & INPUT_JUMP and self.is_grounded:
+            self.vy = JUMP_VELOCITY
+
+        # 3. Apply Gravity
+        self.vy += GRAVITY * delta_time
+        if self.vy > MAX_FALL_SPEED:
+            self.vy = MAX_FALL_SPEED
+
+        # --- Reset grounded state at start of frame update ---
+        self.is_grounded = False
+
+        # 4. Apply Movement (Swept separately along X and Y)
+
+        # Apply X movement
+        self.x, hit = self.sweep_x(level, self.x, self.y, self.width, self.height, self.vx * delta_time)
+        if hit:
+            self.vx = 0.0
+
+        # Apply Y movement
+        self.y, hit = self.sweep_y(level, self.x, self.y, self.width, self.height, self.vy * delta_time)
+        if hit:
+            if self.vy >= 0: # Falling (Hitting Ground)
+                self.is_grounded = True
+            self.vy = 0.0
+
+        # --- Safety Clamp to World Bounds ---
+        self.x = max(0, min(self.x, level.width - self.width))
+
+    def check_collection(self, coins):
+        """Returns the keys of the coins the player touches (a lookup of the overlapped tiles)."""
+        return coins.touching(self.x, self.y, self.width, self.height)
+
+    def check_enemy_collision(self, enemies):
+        """Checks for collision with the enemies near the player and determines outcome (stomp or death).
+        Returns (hit_type, enemy) or (None, None).
+        hit_type: "STOMP" (safe kill) or "LETHAL" (death)
+        """
+        player_rect = self.get_rect()
+        px, py, pw, ph = player_rect
+
+        for enemy in enemies.near(px, px + pw):
+            enemy_rect = enemy.get_rect()
+
+            if CheckCollisionRecs(player_rect, enemy_rect):
+
+                # STOMP Condition:
+                # 1. Player is falling (vy > 0)
+                # 2. Player's bottom is above the enemy's mid-point (approximate stomping zone)
+                is_stompable_zone = py + ph < enemy.y + enemy.height * 0.5
+
+                if self.vy > 0 and is_stompable_zone:
+                    return "STOMP", enemy
+                else:
+                    # Lethal collision (side, head, or missing the stomp zone)
+                    return "LETHAL", enemy
+
+        return None, None
+
+    def reset(self):
+        """Resets the player to their starting position."""
+        self.x = self.start_x
+        self.y = self.start_y
+        self.vx = 0.0
+        self.vy = 0.0
+        self.is_grounded = False
+
+    def draw(self):
+        """Draws the player at their world coordinates."""
+        DrawRectangle(int(self.x), int(self.y), int(self.width), int(self.height), self.color)
+        if self.is_grounded:
+             DrawRectangleLines(int(self.x), int(self.y), int(self.width), int(self.height), WHITE)
+        else:
+             DrawRectangleLines(int(self.x), int(self.y), int(self.width), int(self.height), GRAY)
+
+
+class Enemy:
+    # Tile collision resolver (platformer.bench swaps in other implementations to compare them)
+    sweep_x = staticmethod(sweep_x)
+    sweep_y = staticmethod(sweep_y)
+
+    def __init__(self, x, y):
+        # Position (top-left for collision)
+        self.x = x
+        self.y = y
+        self.width = TILE_SIZE * 0.7
+        self.height = TILE_SIZE * 0.7
+        self.origin = int(x // CHUNK_PIXELS) # Chunk column it spawned in
+
+        # Physics/Movement
+        self.vx = ENEMY_SPEED # Start moving right
+        self.vy = 0.0
+        self.is_grounded = False
+
+    def get_rect(self):
+        """Returns the enemy's collision bounding box."""
+        return (self.x, self.y, self.width, self.height)
+
+    def update(self, delta_time, level):
+        # 1. Apply Gravity
+        if self.is_grounded:
+            self.vy = 0.0
+        self.vy += GRAVITY * delta_time
+        self.is_grounded = False
+
+        # 2. Apply Movement
+
+        # Apply X movement: reverse direction on wall contact
+        self.x, hit = self.sweep_x(level, self.x, self.y, self.width, self.height, self.vx * delta_time)
+        if hit:
+            self.vx *= -1
+
+        # Apply Y movement
+        self.y, hit = self.sweep_y(level, self.x, self.y, self.width, self.height, self.vy * delta_time)
+        if hit:
+            if self.vy >= 0: # Hitting Ground
+                self.is_grounded = True
+            self.vy = 0.0
+
+    def draw(self):
+        """Draws the enemy as a red rectangle with a directional indicator."""
+        DrawRectangle(int(self.x), int(self.y), int(self.width), int(self.height), RED)
+        DrawRectangleLines(int(self.x), int(self.y), int(self.width), int(self.height), BLACK)
+
+        # Draw a small indicator for direction
+        center_x = self.x + self.width / 2
+        center_y = self.y + self.height / 2
+        indicator_size = self.width * 0.2
+
+        if self.vx > 0: # Moving Right
+            DrawTriangle(Vector2(center_x + indicator_size, center_y),
+                         Vector2(center_x - indicator_size, center_y - indicator_size),
+                         Vector2(center_x - indicator_size, center_y + indicator_size), WHITE)
+        elif self.vx < 0: # Moving Left
+            DrawTriangle(Vector2(center_x - indicator_size, center_y),
+                         Vector2(center_x + indicator_size, center_y - indicator_size),
+                         Vector2(center_x + indicator_size, center_y + indicator_size), WHITE)
+
+
+def draw_coins(coins):
+    """Draws the active coins as small yellow diamonds (polygons)."""
+    radius = TILE_SIZE * 0.3 / 2
+
+    for cx, cy in coins:
+        v1 = Vector2(cx, cy - radius * 2)
+        v2 = Vector2(cx + radius * 1.5, cy)
+        v3 = Vector2(cx, cy + radius * 2)
+        v4 = Vector2(cx - radius * 1.5, cy)
+
+        DrawTriangle(v1, v2, v4, YELLOW)
+        DrawTriangle(v2, v3, v4, GOLD)
+
+        DrawLineV(v1, v3, BLACK)
+        DrawLineV(v2, v4, BLACK)
@@ -0,0 +1,242 @@
+import hashlib
+import time
+from raylib import *
+
+from .camera import FollowCamera
+from .controls import InputRecorder, KeyboardInput, ReplayInput
+from .entities import STOMP_BOUNCE, ChunkBuckets, CoinMap, Enemy, Player, draw_coins
+from .tilemap import TILE_COIN, TILE_SIZE, ChunkedTilemap, chunk_range
+
+# --- Game Constants ---
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+ACTIVE_MARGIN = 1       # Chunk columns beyond the view where enemies still move; further out they are frozen
+
+# Physics runs in fixed steps, so jump heights and replays don't depend on the frame rate
+FIXED_STEP = 1 / 120
+MAX_FRAME_TIME = 0.25   # Longer frames (window drags, breakpoints) are clamped instead of caught up
+
+
+class Game:
+    """
+    One platformer session: a streamed level, the player, the coins and enemies spawned
+    from it, the camera and the score. With `scrolling` off the camera stays on the
+    top-left screen of the level, for single-screen maps.
+    """
+    def __init__(self, level, player_color=GOLD, scrolling=True,
+                 screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT):
+        self.level = level
+        self.scrolling = scrolling
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+
+        # Player starts at TILE_SIZE * 2, TILE_SIZE * 2
+        self.player = Player(TILE_SIZE * 2, TILE_SIZE * 2, player_color)
+        self.coins = CoinMap()
+        self.enemies = ChunkBuckets()
+        self.score = 0
+
+        # The camera publishes the visible tile rect every system below works from
+        if scrolling:
+            start_x = self.player.x + self.player.width / 2
+            start_y = self.player.y + self.player.height / 2
+        else:
+            start_x, start_y = screen_width / 2, screen_height / 2
+        self.camera = FollowCamera(screen_width, screen_height, level.width, level.height, start_x, start_y)
+
+        # Pre-rendered level chunks, baked as they come into view
+        self.tilemap = ChunkedTilemap(level)
+
+    def spawn_streamed(self):
+        """
+        Streams in the chunks around the view, drops whatever lived in chunks the level
+        evicted, and spawns the coins/enemies the new chunks contain.
+        """
+        self.level.stream(self.camera.tiles)
+        for chunk_col, chunk_row in self.level.take_evicted():
+            self.tilemap.forget(chunk_col, chunk_row)
+            self.coins.drop_chunk(chunk_col, chunk_row)
+            self.enemies.drop_origin(chunk_col)
+        for tile, x, y in self.level.take_spawns():
+            if tile == TILE_COIN:
+                self.coins.add(x // TILE_SIZE, y // TILE_SIZE)
+            else:
+                # Enemy position is top-left
+                self.enemies.add(x, Enemy(x, y))
+
+    def step(self, delta_time, buttons):
+        """Advances the game by one physics step with the given input bits."""
+        self.spawn_streamed()
+        player = self.player
+        player.update(delta_time, self.level, buttons)
+
+        # Update Enemies: only those in the activation zone around the camera move,
+        # the rest stay frozen until the camera comes near
+        first_col, last_col, _, _ = chunk_range(
+            self.camera.tiles, self.level.chunk_cols, self.level.chunk_rows, ACTIVE_MARGIN)
+        for enemy in self.enemies.in_columns(first_col, last_col):
+            old_x = enemy.x
+            enemy.update(delta_time, self.level)
+            if enemy.y > self.level.height:
+                self.enemies.remove(old_x, enemy) # Fell into a pit
+            else:
+                self.enemies.move(old_x, enemy.x, enemy)
+
+        if self.scrolling:
+            self.camera.update(delta_time, player)
+
+        # Check for coin collection
+        for key in player.check_collection(self.coins):
+            self.coins.remove(key)
+            self.score += 10
+
+        # Check for enemy collision (Stomp/Death/Reset)
+        hit_type, enemy = player.check_enemy_collision(self.enemies)
+
+        if hit_type == "STOMP":
+            # Stomp mechanic: Remove enemy, score, and bounce
+            self.enemies.remove(enemy.x, enemy)
+            self.score += 100
+            player.vy = STOMP_BOUNCE # Player bounces up
+
+        elif hit_type == "LETHAL" or player.y > self.level.height: # Hit, or fell into a pit
+            # Death/Reset mechanic: Penalty and restart
+            player.reset()
+            self.score = max(0, self.score - 50)
+
+    def fingerprint(self):
+        """Short hash of the simulation state; a replay must reproduce it exactly."""
+        player = self.player
+        state = [self.score, len(self.coins), player.x, player.y, player.vx, player.vy]
+        for column in sorted(self.enemies.buckets):
+            for enemy in self.enemies.buckets[column]:
+                state += (enemy.x, enemy.y, enemy.vx)
+        return hashlib.sha1(repr(state).encode()).hexdigest()[:16]
+
+    def draw(self, draw_hud=None):
+        """Draws the frame; `draw_hud(game)`, if given, draws the screen-space HUD."""
+        # Bake newly visible chunks before the camera transform is set up
+        self.tilemap.bake_visible(self.camera.tiles)
+
+        BeginDrawing()
+        ClearBackground(SKYBLUE)
+
+        # Start the 2D camera mode. All drawing commands that follow will be relative to the camera's view.
+        BeginMode2D(self.camera.camera)
+
+        # 1. Draw the Level
+        self.tilemap.draw(self.camera.tiles)
+
+        # 2. Draw Collectibles (only the visible tiles)
+        draw_coins(self.coins.in_tiles(*self.camera.tiles))
+
+        # 3. Draw Enemies (only the visible columns; enemies in the column to the left
+        # of the view can still poke into it)
+        first_col, last_col, _, _ = chunk_range(self.camera.tiles, self.level.chunk_cols, self.level.chunk_rows)
+        for enemy in self.enemies.in_columns(first_col - 1, last_col):
+            enemy.draw()
+
+        # 4. Draw Player (Drawn at world coordinates, the camera handles the translation)
+        self.player.draw()
+
+        # End the 2D camera mode
+        EndMode2D()
+
+        # 5. Draw HUD/Debug Info (Drawn on screen, outside of BeginMode2D)
+        if draw_hud:
+            draw_hud(self)
+
+        EndDrawing()
+
+    def unload(self):
+        self.tilemap.unload()
+        self.level.close()
+
+
+def open_controls(game, record_path=None, replay_path=None):
+    """Returns the input provider for a run: a replay, a recorded keyboard, or the plain keyboard."""
+    if replay_path:
+        controls = ReplayInput(replay_path)
+        if controls.step_time != FIXED_STEP:
+            raise ValueError(f"recording uses a {controls.step_time}s step, expected {FIXED_STEP}s")
+        if controls.level_checksum != game.level.checksum():
+            print("Warning: the level has changed since this run was recorded; expect it to diverge")
+        return controls
+
+    controls = KeyboardInput()
+    if record_path:
+        controls = InputRecorder(controls, record_path, FIXED_STEP, game.level.checksum())
+    return controls
+
+def run(title, game, draw_hud=None, record_path=None, replay_path=None):
+    """
+    Opens a window and runs `game` until it is closed (or the replay runs out). Physics
+    advances in FIXED_STEP steps, as many per frame as the elapsed time calls for.
+    """
+    controls = open_controls(game, record_path, replay_path)
+
+    InitWindow(game.screen_width, game.screen_height, title.encode('utf-8'))
+    SetTargetFPS(60)
+
+    accumulator = 0.0
+    running = True
+    while running and not WindowShouldClose():
+        controls.poll()
+        accumulator += min(GetFrameTime(), MAX_FRAME_TIME)
+        while accumulator >= FIXED_STEP:
+            buttons = controls.next_step()
+            if buttons is None:
+                running = False # Replay finished
+                break
+            game.step(FIXED_STEP, buttons)
+            accumulator -= FIXED_STEP
+
+        game.draw(draw_hud)
+
+    controls.close(game.fingerprint())
+    game.unload()
+    CloseWindow()
+
+def run_headless(game, replay_path):
+    """
+    Replays a recording as fast as possible, without a window, and prints the
+    simulation cost per step: reproducible numbers for profiling and for spotting
+    regressions after a level change.
+    """
+    controls = open_controls(game, replay_path=replay_path)
+    steps = 0
+    worst = 0.0
+    start = time.perf_counter()
+    while True:
+        buttons = controls.next_step()
+        if buttons is None:
+            break
+        step_start = time.perf_counter()
+        game.step(FIXED_STEP, buttons)
+        worst = max(worst, time.perf_counter() - step_start)
+        steps += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{steps} steps ({steps * FIXED_STEP:.1f}s of play) in {elapsed:.3f}s: "
+          f"{steps / max(elapsed, 1e-9):.0f} steps/s, "
+          f"mean {elapsed / max(steps, 1) * 1000:.3f} ms, worst {worst * 1000:.3f} ms")
+    controls.close(game.fingerprint())
+    game.level.close()
+
+def add_run_arguments(parser):
+    """Adds the --record/--replay/--headless options every platformer demo takes."""
+    parser.add_argument("--record", metavar="PATH",
+                        help="record this run's per-step input to PATH")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recording instead of reading the keyboard")
+    parser.add_argument("--headless", action="store_true",
+                        help="with --replay: run it at full speed without a window and print timings")
+
+def run_from_args(args, title, game, draw_hud=None):
+    """Runs `game` as the parsed add_run_arguments() options ask."""
+    if args.headless:
+        if not args.replay:
+            raise SystemExit("--headless needs --replay")
+        run_headless(game, args.replay)
+    else:
+        run(title, game, draw_hud, args.record, args.replay)
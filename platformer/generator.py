@@ -0,0 +1,167 @@
+import hashlib
+import random
+from collections import OrderedDict
+
+from .tilemap import (CHUNK_PIXELS, CHUNK_TILES, STREAM_MARGIN, TILE_AIR, TILE_COIN, TILE_ENEMY,
+                      TILE_SIZE, TILE_SOLID, chunk_range)
+
+# --- Generator Constants ---
+GENERATOR_VERSION = 2         # Bump when generate_chunk changes, so old recordings are flagged
+GENERATED_CHUNK_COLUMNS = 1 << 16 # Endless in practice: 65536 chunks = ~42 million pixels
+MAX_CACHED_CHUNKS = 32        # Generated chunks kept in memory; the least recently used go first
+PREFETCH_CHUNKS = 3           # Chunks generated ahead of the streamed area, on each side
+GENERATION_BUDGET = 1         # Prefetched chunks generated per step at most
+MAX_PIT_WIDTH = 3             # Widest gap in the ground, well inside the player's jump
+PLATFORM_PIT_CLEARANCE = 2    # Columns kept between a floating platform and a pit
+
+
+def generate_chunk(seed, chunk_col):
+    """
+    Generates one CHUNK_TILES x CHUNK_TILES chunk (row-major tiles) from the seed and
+    the chunk's column alone, so a chunk comes out the same however often it is
+    regenerated. Two columns of flat ground at each edge keep the seams walkable; the
+    first chunk has no pits or enemies, so the player starts on safe ground.
+    """
+    rng = random.Random(f"{seed}:{chunk_col}") # String seeds hash the same on every run
+    tiles = bytearray(CHUNK_TILES * CHUNK_TILES)
+    ground = CHUNK_TILES - 1
+    safe = chunk_col == 0
+
+    # 1. Terrain: runs of flat ground, raised steps and (jumpable) pits. A pit never
+    # follows a pit, so runs cannot merge into a gap wider than MAX_PIT_WIDTH
+    heights = [ground] * CHUNK_TILES # Top solid row per column, None for a pit
+    col = 2
+    height = ground
+    while col < CHUNK_TILES - 2:
+        width = min(rng.randint(2, 4), CHUNK_TILES - 2 - col)
+        roll = rng.random()
+        if roll < 0.2 and not safe and height is not None:
+            height = None
+            width = min(width, MAX_PIT_WIDTH)
+        elif roll < 0.45:
+            height = ground - rng.randint(1, 2)
+        else:
+            height = ground
+        for c in range(col, col + width):
+            heights[c] = height
+        col += width
+
+    for c, height in enumerate(heights):
+        if height is not None:
+            for row in range(height, CHUNK_TILES):
+                tiles[row * CHUNK_TILES + c] = TILE_SOLID
+
+    # 2. Floating platforms, mostly topped with coins. They stay clear of pits (a low
+    # platform over the take-off or landing would block the jump) and two rows above
+    # the terrain under them, so the ground below stays walkable
+    for _ in range(rng.randint(0, 2)):
+        length = rng.randint(3, 5)
+        start = rng.randint(1, CHUNK_TILES - 1 - length)
+        row = rng.randint(ground - 5, ground - 3)
+        below = heights[max(0, start - PLATFORM_PIT_CLEARANCE):start + length + PLATFORM_PIT_CLEARANCE]
+        if None in below:
+            continue
+        row = min(row, min(below) - 3)
+        for c in range(start, start + length):
+            tiles[row * CHUNK_TILES + c] = TILE_SOLID
+            if rng.random() < 0.7:
+                tiles[(row - 1) * CHUNK_TILES + c] = TILE_COIN
+
+    # 3. Loose coins and enemies on the ground
+    for c, height in enumerate(heights):
+        if height is None or tiles[(height - 1) * CHUNK_TILES + c] != TILE_AIR:
+            continue
+        roll = rng.random()
+        if roll < 0.12:
+            tiles[(height - 1) * CHUNK_TILES + c] = TILE_COIN
+        elif roll < 0.18 and not safe and c > 1:
+            tiles[(height - 1) * CHUNK_TILES + c] = TILE_ENEMY
+    return tiles
+
+
+class GeneratedLevel:
+    """
+    An endless level generated chunk by chunk from a seed, with the same interface as
+    StreamedLevel. Chunks around the camera are generated when first needed; a few more
+    are prefetched ahead of them, at most GENERATION_BUDGET per step, so generation
+    rarely lands on the frame that needs the chunk. Only MAX_CACHED_CHUNKS chunks are
+    kept (least recently used evicted first), so memory stays bounded on endless runs;
+    an evicted chunk is regenerated identically, coins and enemies included, when the
+    player comes back.
+    """
+    def __init__(self, seed, chunk_cols=GENERATED_CHUNK_COLUMNS):
+        self.seed = seed
+        self.chunk_cols = chunk_cols
+        self.chunk_rows = 1
+        self.cols = chunk_cols * CHUNK_TILES
+        self.rows = CHUNK_TILES
+        self.width = self.cols * TILE_SIZE
+        self.height = self.rows * TILE_SIZE
+        self.chunks = OrderedDict() # chunk column -> tiles, least recently used first
+        self.spawns = []  # (tile, x, y) for entities found in freshly generated chunks
+        self.evicted = [] # (chunk_col, chunk_row) dropped from the cache since the last take_evicted()
+
+    def chunk(self, chunk_col, chunk_row):
+        """Returns the tiles of a chunk, generating it if it is not cached."""
+        tiles = self.chunks.get(chunk_col)
+        if tiles is None:
+            return self.generate(chunk_col)
+        self.chunks.move_to_end(chunk_col)
+        return tiles
+
+    def generate(self, chunk_col):
+        tiles = generate_chunk(self.seed, chunk_col)
+
+        # Pull entity spawn points out of the collision map
+        origin_x = chunk_col * CHUNK_PIXELS
+        for i, tile in enumerate(tiles):
+            if tile == TILE_COIN or tile == TILE_ENEMY:
+                self.spawns.append((tile, origin_x + (i % CHUNK_TILES) * TILE_SIZE, (i // CHUNK_TILES) * TILE_SIZE))
+                tiles[i] = TILE_AIR
+
+        self.chunks[chunk_col] = tiles
+        if len(self.chunks) > MAX_CACHED_CHUNKS:
+            old_col, _ = self.chunks.popitem(last=False)
+            self.evicted.append((old_col, 0))
+        return tiles
+
+    def tile(self, col, row):
+        """Returns the tile at (col, row); everything outside the level is air."""
+        if col < 0 or row < 0 or col >= self.cols or row >= self.rows:
+            return TILE_AIR
+        return self.chunk(col // CHUNK_TILES, 0)[row * CHUNK_TILES + col % CHUNK_TILES]
+
+    def stream(self, tiles):
+        """
+        Makes sure every chunk within STREAM_MARGIN chunks of the visible tile rect is
+        generated, then prefetches the nearest missing chunks beyond that, within budget.
+        """
+        first_col, last_col, _, _ = chunk_range(tiles, self.chunk_cols, 1, STREAM_MARGIN)
+        for chunk_col in range(first_col, last_col + 1):
+            self.chunk(chunk_col, 0)
+
+        budget = GENERATION_BUDGET
+        for distance in range(1, PREFETCH_CHUNKS + 1):
+            for chunk_col in (last_col + distance, first_col - distance):
+                if 0 <= chunk_col < self.chunk_cols and chunk_col not in self.chunks:
+                    self.generate(chunk_col)
+                    budget -= 1
+                    if budget == 0:
+                        return
+
+    def checksum(self):
+        """Returns a short hash identifying the generated level, used to tie recordings to it."""
+        return hashlib.sha1(f"generated:{self.seed}:{GENERATOR_VERSION}".encode()).hexdigest()[:16]
+
+    def take_spawns(self):
+        """Returns and clears the spawns queued by chunk generation."""
+        spawns, self.spawns = self.spawns, []
+        return spawns
+
+    def take_evicted(self):
+        """Returns and clears the chunks evicted from the cache."""
+        evicted, self.evicted = self.evicted, []
+        return evicted
+
+    def close(self):
+        pass
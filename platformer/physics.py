@@ -0,0 +1,56 @@
+import math
+
+from .tilemap import TILE_SIZE, TILE_SOLID
+
+# --- Physics Constants ---
+GRAVITY = 1800.0        # Downward acceleration (pixels/s/s)
+MAX_FALL_SPEED = 1000.0 # Terminal velocity (pixels/s)
+SWEEP_EPSILON = 1e-6    # Tolerance (in tiles) so a box resting exactly on a tile edge doesn't count as overlapping it
+
+# --- Tile Collision ---
+# Swept AABB against the tile grid: a box moving along one axis only visits the tile
+# columns (or rows) its leading edge crosses, and stops flush against the first solid
+# one. Plain arithmetic, no per-tile rectangle tests, and no tunneling at any speed.
+
+def _tile_span(start, size):
+    """Returns the first and last tile index overlapped by the interval [start, start + size)."""
+    return (math.floor(start / TILE_SIZE + SWEEP_EPSILON),
+            math.ceil((start + size) / TILE_SIZE - SWEEP_EPSILON) - 1)
+
+def sweep_x(level, x, y, width, height, dx):
+    """Moves a box horizontally by dx. Returns (new_x, hit), stopping at the first solid column."""
+    first_row, last_row = _tile_span(y, height)
+    if dx > 0:
+        first = math.ceil((x + width) / TILE_SIZE - SWEEP_EPSILON)
+        last = math.ceil((x + width + dx) / TILE_SIZE - SWEEP_EPSILON) - 1
+        for col in range(first, last + 1):
+            for row in range(first_row, last_row + 1):
+                if level.tile(col, row) == TILE_SOLID:
+                    return col * TILE_SIZE - width, True
+    elif dx < 0:
+        first = math.floor(x / TILE_SIZE + SWEEP_EPSILON) - 1
+        last = math.floor((x + dx) / TILE_SIZE + SWEEP_EPSILON)
+        for col in range(first, last - 1, -1):
+            for row in range(first_row, last_row + 1):
+                if level.tile(col, row) == TILE_SOLID:
+                    return (col + 1) * TILE_SIZE, True
+    return x + dx, False
+
+def sweep_y(level, x, y, width, height, dy):
+    """Moves a box vertically by dy. Returns (new_y, hit), stopping at the first solid row."""
+    first_col, last_col = _tile_span(x, width)
+    if dy > 0:
+        first = math.ceil((y + height) / TILE_SIZE - SWEEP_EPSILON)
+        last = math.ceil((y + height + dy) / TILE_SIZE - SWEEP_EPSILON) - 1
+        for row in range(first, last + 1):
+            for col in range(first_col, last_col + 1):
+                if level.tile(col, row) == TILE_SOLID:
+                    return row * TILE_SIZE - height, True
+    elif dy < 0:
+        first = math.floor(y / TILE_SIZE + SWEEP_EPSILON) - 1
+        last = math.floor((y + dy) / TILE_SIZE + SWEEP_EPSILON)
+        for row in range(first, last - 1, -1):
+            for col in range(first_col, last_col + 1):
+                if level.tile(col, row) == TILE_SOLID:
+                    return (row + 1) * TILE_SIZE, True
+    return y + dy, False
@@ -0,0 +1,272 @@
+import hashlib
+import math
+import mmap
+import os
+from collections import OrderedDict
+from struct import Struct
+from raylib import *
+
+# --- Tile Constants ---
+TILE_SIZE = 40          # Size of one tile in pixels
+TILE_AIR = 0
+TILE_SOLID = 1
+TILE_COIN = 2
+TILE_ENEMY = 3
+
+CHUNK_TILES = 16        # Chunk edge in tiles; each chunk is decoded and pre-rendered once (16 * 40 = 640px)
+CHUNK_PIXELS = CHUNK_TILES * TILE_SIZE
+STREAM_MARGIN = 1       # Chunks decoded ahead of the camera view on every side
+MAX_BAKED_CHUNKS = 24   # Chunk textures kept (~1.6 MB of VRAM each); the least recently visible go first
+
+# --- Level File Format ---
+# Header, then one index entry per CHUNK_TILES x CHUNK_TILES chunk (row-major over chunks),
+# then the chunk payloads: one byte per tile, row-major, stored raw or run-length encoded
+LEVEL_MAGIC = b"PLVL"
+LEVEL_VERSION = 1
+LEVEL_HEADER = Struct("<4sHHII")  # magic, version, chunk size in tiles, columns, rows
+LEVEL_CHUNK_ENTRY = Struct("<IIB") # payload offset, payload size, encoding
+CHUNK_RAW = 0
+CHUNK_RLE = 1
+
+
+def chunk_range(tiles, chunk_cols, chunk_rows, margin=0):
+    """
+    Returns (first_col, last_col, first_row, last_row): the chunks overlapped by the
+    tile rect `tiles` (first_col, last_col, first_row, last_row), grown by `margin`
+    chunks on every side and clamped to the level.
+    """
+    first_col, last_col, first_row, last_row = tiles
+    return (max(0, first_col // CHUNK_TILES - margin),
+            min(chunk_cols - 1, last_col // CHUNK_TILES + margin),
+            max(0, first_row // CHUNK_TILES - margin),
+            min(chunk_rows - 1, last_row // CHUNK_TILES + margin))
+
+def rle_encode(data):
+    """Run-length encodes bytes as (count, value) pairs, with runs capped at 255."""
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        value = data[i]
+        run = 1
+        while i + run < len(data) and run < 255 and data[i + run] == value:
+            run += 1
+        out += bytes((run, value))
+        i += run
+    return bytes(out)
+
+def rle_decode(data):
+    """Expands (count, value) pairs back into a bytearray."""
+    out = bytearray()
+    for i in range(0, len(data), 2):
+        out += data[i + 1:i + 2] * data[i]
+    return out
+
+def encode_level(level):
+    """
+    Packs a list-of-rows tilemap into the level file format. Edge chunks are padded
+    with air, and each chunk is stored RLE-compressed when that is smaller than raw.
+    """
+    rows, cols = len(level), len(level[0])
+    payloads = []
+    for chunk_row in range(math.ceil(rows / CHUNK_TILES)):
+        for chunk_col in range(math.ceil(cols / CHUNK_TILES)):
+            tiles = bytearray(CHUNK_TILES * CHUNK_TILES) # All TILE_AIR
+            first_col = chunk_col * CHUNK_TILES
+            for r in range(min(CHUNK_TILES, rows - chunk_row * CHUNK_TILES)):
+                strip = level[chunk_row * CHUNK_TILES + r][first_col:first_col + CHUNK_TILES]
+                tiles[r * CHUNK_TILES:r * CHUNK_TILES + len(strip)] = bytes(strip)
+
+            packed = rle_encode(tiles)
+            if len(packed) < len(tiles):
+                payloads.append((CHUNK_RLE, packed))
+            else:
+                payloads.append((CHUNK_RAW, bytes(tiles)))
+
+    out = bytearray(LEVEL_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, CHUNK_TILES, cols, rows))
+    offset = LEVEL_HEADER.size + LEVEL_CHUNK_ENTRY.size * len(payloads)
+    for encoding, payload in payloads:
+        out += LEVEL_CHUNK_ENTRY.pack(offset, len(payload), encoding)
+        offset += len(payload)
+    for _, payload in payloads:
+        out += payload
+    return bytes(out)
+
+
+class StreamedLevel:
+    """
+    A level in the level file format, backed by bytes or a memory-mapped file. Only the
+    header is read up front; each chunk is decoded the first time it is touched (streamed
+    in ahead of the camera, or by a tile lookup), so startup time and memory stay flat no
+    matter how large the world is. Decoding a chunk turns its coin and enemy tiles into
+    air and queues them as spawns for the game loop.
+    """
+    def __init__(self, buffer):
+        self.buffer = buffer
+        magic, version, chunk_tiles, self.cols, self.rows = LEVEL_HEADER.unpack_from(buffer, 0)
+        if magic != LEVEL_MAGIC or version != LEVEL_VERSION:
+            raise ValueError("not a level file, or an unsupported version")
+        if chunk_tiles != CHUNK_TILES:
+            raise ValueError(f"level uses {chunk_tiles}-tile chunks, expected {CHUNK_TILES}")
+
+        self.width = self.cols * TILE_SIZE
+        self.height = self.rows * TILE_SIZE
+        self.chunk_cols = math.ceil(self.cols / CHUNK_TILES)
+        self.chunk_rows = math.ceil(self.rows / CHUNK_TILES)
+        self.chunks = {} # chunk index -> decoded tiles (bytearray, row-major)
+        self.spawns = [] # (tile, x, y) for entities found in freshly decoded chunks
+
+    @classmethod
+    def open(cls, path):
+        """Memory-maps a level file; chunk payloads are paged in only when decoded."""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def chunk(self, chunk_col, chunk_row):
+        """Returns the decoded tiles of a chunk, decoding it on first use."""
+        index = chunk_row * self.chunk_cols + chunk_col
+        tiles = self.chunks.get(index)
+        if tiles is None:
+            tiles = self.decode_chunk(index)
+        return tiles
+
+    def decode_chunk(self, index):
+        offset, size, encoding = LEVEL_CHUNK_ENTRY.unpack_from(
+            self.buffer, LEVEL_HEADER.size + index * LEVEL_CHUNK_ENTRY.size)
+        payload = self.buffer[offset:offset + size]
+        tiles = rle_decode(payload) if encoding == CHUNK_RLE else bytearray(payload)
+
+        # Pull entity spawn points out of the collision map
+        if TILE_COIN in tiles or TILE_ENEMY in tiles:
+            origin_x = (index % self.chunk_cols) * CHUNK_PIXELS
+            origin_y = (index // self.chunk_cols) * CHUNK_PIXELS
+            for i, tile in enumerate(tiles):
+                if tile == TILE_COIN or tile == TILE_ENEMY:
+                    x = origin_x + (i % CHUNK_TILES) * TILE_SIZE
+                    y = origin_y + (i // CHUNK_TILES) * TILE_SIZE
+                    self.spawns.append((tile, x, y))
+                    tiles[i] = TILE_AIR
+
+        self.chunks[index] = tiles
+        return tiles
+
+    def tile(self, col, row):
+        """Returns the tile at (col, row); everything outside the level is air."""
+        if col < 0 or row < 0 or col >= self.cols or row >= self.rows:
+            return TILE_AIR
+        tiles = self.chunk(col // CHUNK_TILES, row // CHUNK_TILES)
+        return tiles[(row % CHUNK_TILES) * CHUNK_TILES + col % CHUNK_TILES]
+
+    def stream(self, tiles):
+        """Decodes every chunk within STREAM_MARGIN chunks of the visible tile rect."""
+        first_col, last_col, first_row, last_row = chunk_range(
+            tiles, self.chunk_cols, self.chunk_rows, STREAM_MARGIN)
+        for chunk_row in range(first_row, last_row + 1):
+            for chunk_col in range(first_col, last_col + 1):
+                self.chunk(chunk_col, chunk_row)
+
+    def checksum(self):
+        """Returns a short hash of the whole level file, used to tie recordings to a level."""
+        return hashlib.sha1(self.buffer).hexdigest()[:16]
+
+    def take_spawns(self):
+        """Returns and clears the spawns queued by chunk decoding."""
+        spawns, self.spawns = self.spawns, []
+        return spawns
+
+    def take_evicted(self):
+        """File levels keep every decoded chunk, so nothing is ever evicted."""
+        return []
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+def load_level(path, fallback):
+    """Opens the level file at `path`, or packs the list-of-rows `fallback` map if there is none."""
+    if path and os.path.exists(path):
+        return StreamedLevel.open(path)
+    return StreamedLevel(encode_level(fallback))
+
+
+class ChunkedTilemap:
+    """
+    The level's solid tiles, drawn per chunk. Each chunk is baked once into a
+    RenderTexture the first time it comes into view (chunks with no solid tiles get
+    none), and only the chunks intersecting the view are drawn, so the per-frame cost
+    depends on the screen size, not the level size. At most MAX_BAKED_CHUNKS textures
+    are kept, the least recently visible unloaded first and baked again if they come
+    back into view, so video memory stays bounded however far the camera travels.
+    """
+    def __init__(self, level):
+        self.level = level
+        self.chunks = OrderedDict() # (chunk_col, chunk_row) -> RenderTexture, or None if empty; least recently visible first
+
+    def visible_chunks(self, tiles):
+        """Yields (chunk_col, chunk_row) for every chunk the visible tile rect overlaps."""
+        first_col, last_col, first_row, last_row = chunk_range(
+            tiles, self.level.chunk_cols, self.level.chunk_rows)
+        for chunk_row in range(first_row, last_row + 1):
+            for chunk_col in range(first_col, last_col + 1):
+                yield chunk_col, chunk_row
+
+    def bake_chunk(self, chunk_col, chunk_row):
+        """Draws the chunk's solid tiles into a new RenderTexture (None if it has none)."""
+        tiles = self.level.chunk(chunk_col, chunk_row)
+        solid = [i for i, tile in enumerate(tiles) if tile == TILE_SOLID]
+        if not solid:
+            return None
+
+        texture = LoadRenderTexture(CHUNK_PIXELS, CHUNK_PIXELS)
+        BeginTextureMode(texture)
+        ClearBackground(BLANK)
+        for i in solid:
+            x = (i % CHUNK_TILES) * TILE_SIZE
+            y = (i // CHUNK_TILES) * TILE_SIZE
+
+            # Draw solid block
+            DrawRectangle(x, y, TILE_SIZE, TILE_SIZE, DARKGRAY)
+            # Draw edge lines for clarity
+            DrawRectangleLines(x, y, TILE_SIZE, TILE_SIZE, BLACK)
+        EndTextureMode()
+        return texture
+
+    def bake_visible(self, tiles):
+        """
+        Bakes any visible chunk that is not baked yet and unloads the least recently
+        visible textures beyond MAX_BAKED_CHUNKS. Call it before BeginMode2D: texture
+        mode resets the camera transform.
+        """
+        visible = 0
+        for key in self.visible_chunks(tiles):
+            visible += 1
+            if key in self.chunks:
+                self.chunks.move_to_end(key)
+            else:
+                self.chunks[key] = self.bake_chunk(*key)
+
+        # The visible chunks were just moved to the end, so only off-screen ones go
+        while len(self.chunks) > max(MAX_BAKED_CHUNKS, visible):
+            _, texture = self.chunks.popitem(last=False)
+            if texture is not None:
+                UnloadRenderTexture(texture)
+
+    def draw(self, tiles):
+        """Draws the visible chunks (inside BeginMode2D)."""
+        for key in self.visible_chunks(tiles):
+            texture = self.chunks.get(key)
+            if texture is not None:
+                # Negative source height: render textures are stored upside down
+                DrawTextureRec(texture.texture, (0, 0, CHUNK_PIXELS, -CHUNK_PIXELS),
+                               (key[0] * CHUNK_PIXELS, key[1] * CHUNK_PIXELS), WHITE)
+
+    def forget(self, chunk_col, chunk_row):
+        """Unloads a chunk's texture (the level evicted it); it is baked again if it comes back."""
+        texture = self.chunks.pop((chunk_col, chunk_row), None)
+        if texture is not None:
+            UnloadRenderTexture(texture)
+
+    def unload(self):
+        for texture in self.chunks.values():
+            if texture is not None:
+                UnloadRenderTexture(texture)
+        self.chunks.clear()
@@ -0,0 +1,9 @@
+"""
+Shared engine pieces for the shooter demos (7. Asteroids and 8. Shmup): columnar
+entity storage with pooled entity handles, a batch renderer that draws a frame's
+shapes in one rlgl draw call, and the headless soak harness with per-system timings.
+"""
+
+from .batch import BatchRenderer
+from .entities import Column, Entity, EntityStore, Pool, PooledEntity, freeze_heap
+from .soak import SystemTimings, play_headless
@@ -0,0 +1,134 @@
+import math
+import numpy as np
+from raylib import *
+
+
+class BatchRenderer:
+    """
+    Collects a frame's shapes as triangles in NumPy vertex arrays and submits them
+    through rlgl in one vertex buffer upload and one draw call. Shapes are added a whole
+    group at a time straight from entity arrays (one call per primitive and colour),
+    so draw cost no longer scales with the number of Python-to-raylib calls.
+    Colours are either one Color for the group or an (n, 4) array with one per shape.
+    """
+    def __init__(self, max_vertices=1 << 16):
+        self.max_vertices = max_vertices
+        self.positions = np.zeros((max_vertices, 3), dtype=np.float32) # z stays 0
+        self.colors = np.zeros((max_vertices, 4), dtype=np.uint8)
+        self.count = 0
+        self.circle_tables = {} # segments -> (cos, sin) around the unit circle
+        self.white = ffi.new("float[4]", [1.0, 1.0, 1.0, 1.0])
+        self.vao = 0
+
+    def load(self):
+        """Creates the vertex array and buffers; needs the window's GL context."""
+        self.vao = rlLoadVertexArray()
+        rlEnableVertexArray(self.vao)
+        # Attribute locations of raylib's default shader: position (vec3) and colour
+        self.position_vbo = rlLoadVertexBuffer(ffi.from_buffer(self.positions), self.positions.nbytes, True)
+        rlSetVertexAttribute(RL_DEFAULT_SHADER_ATTRIB_LOCATION_POSITION, 3, RL_FLOAT, False, 0, 0)
+        rlEnableVertexAttribute(RL_DEFAULT_SHADER_ATTRIB_LOCATION_POSITION)
+        self.color_vbo = rlLoadVertexBuffer(ffi.from_buffer(self.colors), self.colors.nbytes, True)
+        rlSetVertexAttribute(RL_DEFAULT_SHADER_ATTRIB_LOCATION_COLOR, 4, RL_UNSIGNED_BYTE, True, 0, 0)
+        rlEnableVertexAttribute(RL_DEFAULT_SHADER_ATTRIB_LOCATION_COLOR)
+        rlDisableVertexArray()
+
+    def unload(self):
+        rlUnloadVertexBuffer(self.position_vbo)
+        rlUnloadVertexBuffer(self.color_vbo)
+        rlUnloadVertexArray(self.vao)
+
+    def _batches(self, n, per_shape):
+        """
+        Reserves vertex space for `n` shapes of `per_shape` vertices, flushing when the
+        buffer fills. Yields (first, last, positions, colors) per chunk, with the views
+        shaped (shapes, per_shape, 3) and (shapes, per_shape, 4).
+        """
+        first = 0
+        while first < n:
+            if self.count + per_shape > self.max_vertices:
+                self.flush()
+            last = min(n, first + (self.max_vertices - self.count) // per_shape)
+            start, self.count = self.count, self.count + (last - first) * per_shape
+            yield (first, last,
+                   self.positions[start:self.count].reshape(last - first, per_shape, 3),
+                   self.colors[start:self.count].reshape(last - first, per_shape, 4))
+            first = last
+
+    @staticmethod
+    def _fill_colors(colors, color, first, last):
+        color = np.asarray(color, dtype=np.uint8)
+        colors[:] = color if color.ndim == 1 else color[first:last, None, :]
+
+    def _circle_table(self, segments):
+        if segments not in self.circle_tables:
+            angles = np.linspace(0.0, 2 * math.pi, segments + 1)
+            self.circle_tables[segments] = (np.cos(angles), np.sin(angles))
+        return self.circle_tables[segments]
+
+    def add_triangles(self, x1, y1, x2, y2, x3, y3, color):
+        """Filled triangles, one per element of the corner coordinate arrays."""
+        corners = np.broadcast_arrays(x1, y1, x2, y2, x3, y3)
+        n = corners[0].size
+        for first, last, pos, col in self._batches(n, 3):
+            for k in range(3):
+                pos[:, k, 0] = corners[2 * k].ravel()[first:last]
+                pos[:, k, 1] = corners[2 * k + 1].ravel()[first:last]
+            self._fill_colors(col, color, first, last)
+
+    def add_circles(self, x, y, radius, color, segments=12):
+        """Filled circles as triangle fans."""
+        x, y, radius = (a.ravel() for a in np.broadcast_arrays(x, y, radius))
+        cos, sin = self._circle_table(segments)
+        for first, last, pos, col in self._batches(x.size, segments * 3):
+            cx, cy, r = x[first:last, None], y[first:last, None], radius[first:last, None]
+            fan = pos.reshape(last - first, segments, 3, 3)
+            fan[:, :, 0, 0] = cx
+            fan[:, :, 0, 1] = cy
+            fan[:, :, 1, 0] = cx + r * cos[:-1]
+            fan[:, :, 1, 1] = cy + r * sin[:-1]
+            fan[:, :, 2, 0] = cx + r * cos[1:]
+            fan[:, :, 2, 1] = cy + r * sin[1:]
+            self._fill_colors(col, color, first, last)
+
+    def add_lines(self, x1, y1, x2, y2, color, thickness=1.0):
+        """Line segments as thin quads."""
+        x1, y1, x2, y2 = (a.ravel().astype(np.float64) for a in np.broadcast_arrays(x1, y1, x2, y2))
+        dx, dy = x2 - x1, y2 - y1
+        length = np.hypot(dx, dy)
+        length[length == 0] = 1.0
+        nx = -dy / length * (thickness / 2) # Half-width offset across the line
+        ny = dx / length * (thickness / 2)
+        for first, last, pos, col in self._batches(x1.size, 6):
+            s = slice(first, last)
+            a = (x1[s] + nx[s], y1[s] + ny[s])
+            b = (x1[s] - nx[s], y1[s] - ny[s])
+            c = (x2[s] + nx[s], y2[s] + ny[s])
+            d = (x2[s] - nx[s], y2[s] - ny[s])
+            for k, (px, py) in enumerate((a, b, c, b, d, c)):
+                pos[:, k, 0] = px
+                pos[:, k, 1] = py
+            self._fill_colors(col, color, first, last)
+
+    def flush(self):
+        """Draws everything added since the last flush with raylib's default shader."""
+        if self.count == 0:
+            return
+        rlDrawRenderBatchActive() # Keep ordering with raylib's own immediate-mode batch
+        rlDisableBackfaceCulling() # Screen space flips the winding; draw both sides
+        locs = rlGetShaderLocsDefault()
+        rlEnableShader(rlGetShaderIdDefault())
+        rlSetUniformMatrix(locs[SHADER_LOC_MATRIX_MVP],
+                           MatrixMultiply(rlGetMatrixModelview(), rlGetMatrixProjection()))
+        rlSetUniform(locs[SHADER_LOC_COLOR_DIFFUSE], self.white, RL_SHADER_UNIFORM_VEC4, 1)
+        rlActiveTextureSlot(0)
+        rlEnableTexture(rlGetTextureIdDefault()) # 1x1 white texel, so vertex colours pass through
+        rlUpdateVertexBuffer(self.position_vbo, ffi.from_buffer(self.positions), self.count * 12, 0)
+        rlUpdateVertexBuffer(self.color_vbo, ffi.from_buffer(self.colors), self.count * 4, 0)
+        rlEnableVertexArray(self.vao)
+        rlDrawVertexArray(0, self.count)
+        rlDisableVertexArray()
+        rlDisableTexture()
+        rlDisableShader()
+        rlEnableBackfaceCulling()
+        self.count = 0
@@ -0,0 +1,162 @@
+import gc
+import numpy as np
+
+
+class Pool:
+    """
+    Fixed-capacity pool of pre-allocated entities. `acquire` re-spawns a free entity
+    instead of allocating a new one, `active` lists the entities in use, and
+    `release_inactive` compacts that list in place and returns finished entities to the
+    free list, so steady-state gameplay creates no objects for the GC to track.
+    """
+    def __init__(self, factory, capacity):
+        self.free = [factory() for _ in range(capacity)]
+        self.active = []
+        # Every pooled entity keeps its store slot for life, so the pool's slots are fixed
+        self.slots = np.array([entity.slot for entity in self.free], dtype=np.intp)
+
+    def acquire(self, *spawn_args):
+        """Spawns and returns a pooled entity, or None when the pool is exhausted."""
+        if not self.free:
+            return None
+        entity = self.free.pop()
+        entity.spawn(*spawn_args)
+        self.active.append(entity)
+        return entity
+
+    def release_inactive(self):
+        """Removes inactive entities from `active` (keeping order) and frees them for reuse."""
+        active = self.active
+        keep = 0
+        for entity in active:
+            if entity.is_active:
+                active[keep] = entity
+                keep += 1
+            else:
+                self.free.append(entity)
+        del active[keep:]
+
+    def clear(self):
+        for entity in self.active:
+            entity.is_active = False
+        self.release_inactive()
+
+    def live_slots(self, store):
+        """Store slots of this pool's active entities, for batch drawing."""
+        return self.slots[store.active[self.slots]]
+
+
+class EntityStore:
+    """
+    Columnar storage for every entity in the game: one NumPy array per field and one
+    slot per entity. Movement, screen wrapping or off-screen culling, and lifetime decay
+    run as single vectorized passes over all slots instead of a Python method call per
+    entity. Games that need more per-entity fields subclass it and add arrays.
+    """
+    def __init__(self, capacity):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.radius = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.lifetime = np.full(capacity, np.inf) # Seconds left; inf = lives until destroyed
+        self.free_slots = list(range(capacity - 1, -1, -1))
+
+    def allocate(self):
+        if not self.free_slots:
+            raise RuntimeError("EntityStore is full; raise its capacity")
+        return self.free_slots.pop()
+
+    def release(self, slot):
+        self.active[slot] = False
+        self.free_slots.append(slot)
+
+    def integrate(self, delta_time):
+        # Inactive slots move too; that is cheaper than masking and they are never read
+        self.x += self.vx * delta_time
+        self.y += self.vy * delta_time
+
+    def wrap(self, width, height):
+        """Screen wrapping, same rule as before: leaving one edge re-enters at the opposite one."""
+        self.x[self.x > width] = 0
+        self.x[self.x < 0] = width
+        self.y[self.y > height] = 0
+        self.y[self.y < 0] = height
+
+    def cull(self, width, height, margin):
+        """Deactivates entities more than `margin` pixels off-screen (for cleanup)."""
+        self.active &= (self.x >= -margin) & (self.x <= width + margin) & \
+                       (self.y >= -margin) & (self.y <= height + margin)
+
+    def decay_lifetimes(self, delta_time):
+        self.lifetime -= delta_time
+        self.active[self.lifetime <= 0] = False
+
+
+class Column:
+    """Descriptor exposing one EntityStore array as an attribute of an entity handle."""
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, entity, owner=None):
+        if entity is None:
+            return self
+        return getattr(entity.store, self.name)[entity.slot]
+
+    def __set__(self, entity, value):
+        getattr(entity.store, self.name)[entity.slot] = value
+
+
+class Entity:
+    """
+    Base class for the games' ships, bullets, asteroids and enemies: a lightweight
+    handle to one EntityStore slot. Movement and screen wrapping or culling happen in
+    the store's vectorized passes.
+    """
+    __slots__ = ('store', 'slot')
+    
+    x = Column('x')
+    y = Column('y')
+    vx = Column('vx')
+    vy = Column('vy')
+    radius = Column('radius')
+    is_active = Column('active')
+    lifetime = Column('lifetime')
+    
+    def __init__(self, store, x, y, vx, vy, radius=0.0):
+        self.store = store
+        self.slot = store.allocate()
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.radius = radius
+        self.lifetime = np.inf
+        self.is_active = True
+
+    def release(self):
+        """Gives the store slot back (only for entities that are not pooled)."""
+        self.store.release(self.slot)
+
+
+class PooledEntity(Entity):
+    """
+    An entity that lives in a Pool: created inactive at the origin when the pool is
+    filled, and brought to life by its `spawn` each time the pool hands it out.
+    """
+    __slots__ = ()
+    
+    def __init__(self, store, radius=0.0):
+        super().__init__(store, 0.0, 0.0, 0.0, 0.0, radius)
+        self.is_active = False
+
+
+def freeze_heap():
+    """
+    Call once everything the game needs is allocated. All of it lives for the whole
+    game: moving it out of the collector's view leaves collections during play less
+    to scan.
+    """
+    gc.collect()
+    gc.freeze()
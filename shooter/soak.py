@@ -0,0 +1,74 @@
+"""
+Headless soak harness for the shooter demos: per-system frame timings that a game's
+`step` fills in while playing, and a loop that plays a game from scripted or recorded
+input at full speed with no window, then reports those timings, peak pool usage and
+GC activity.
+"""
+import gc
+import time
+
+
+class SystemTimings:
+    """
+    Seconds spent per system (`total`) and the slowest single frame per system
+    (`worst`). A frame calls `start`, then `lap` after each system it runs.
+    """
+    def __init__(self, systems):
+        self.systems = systems
+        self.total = {system: 0.0 for system in systems}
+        self.worst = {system: 0.0 for system in systems}
+        self.last = 0.0
+
+    def start(self):
+        self.last = time.perf_counter()
+
+    def lap(self, system):
+        """Charges the time since `start` or the previous lap to `system`."""
+        now = time.perf_counter()
+        seconds = now - self.last
+        self.last = now
+        self.total[system] += seconds
+        if seconds > self.worst[system]:
+            self.worst[system] = seconds
+
+    def report(self, frames):
+        print(f"{'system':<12}{'total ms':>10}{'mean us':>10}{'worst us':>10}")
+        for system in self.systems:
+            print(f"{system:<12}{self.total[system] * 1e3:>10.1f}"
+                  f"{self.total[system] / max(frames, 1) * 1e6:>10.1f}{self.worst[system] * 1e6:>10.1f}")
+
+
+def play_headless(game, controls, label, peaks, outcome=lambda game: f"last score {game.score}"):
+    """
+    Steps `game` with frames from `controls` until they run out, at full speed and with
+    no window, then prints `game.timings`, peak entity counts and GC activity. `peaks`
+    maps a name to (count function of the game, capacity); `outcome` describes how
+    the last game ended.
+    """
+    peak = {name: 0 for name in peaks}
+    games = 1
+    frames = 0
+
+    gc.collect()
+    collections_before = [stats['collections'] for stats in gc.get_stats()]
+    start = time.perf_counter()
+    while True:
+        frame = controls.next_frame()
+        if frame is None:
+            break
+        frames += 1
+        was_ready = game.game_state == "READY"
+        game.step(*frame)
+        if game.game_state == "READY" and not was_ready:
+            games += 1
+        for name, (count, _) in peaks.items():
+            peak[name] = max(peak[name], count(game))
+    elapsed = time.perf_counter() - start
+    collections = [stats['collections'] - before for stats, before in zip(gc.get_stats(), collections_before)]
+
+    print(f"{label}: {frames} frames: {elapsed:.2f} s ({frames / max(elapsed, 1e-9):.0f} frames/s)")
+    game.timings.report(frames)
+    print("Peak entities: " + ", ".join(f"{name} {peak[name]}/{capacity}"
+                                        for name, (_, capacity) in peaks.items()))
+    print(f"Games played: {games} ({outcome(game)})")
+    print("GC collections: " + ", ".join(f"gen{i} {n}" for i, n in enumerate(collections)))
@@ -0,0 +1,25 @@
+from platformer.entities import JUMP_VELOCITY, PLAYER_SPEED, PLAYER_WIDTH
+from platformer.generator import MAX_PIT_WIDTH, generate_chunk
+from platformer.physics import GRAVITY
+from platformer.tilemap import CHUNK_TILES, TILE_SIZE, TILE_SOLID
+
+
+def widest_gap(seed, chunks):
+    """Widest run of consecutive columns with no ground, across chunk seams."""
+    widest = run = 0
+    for chunk_col in range(chunks):
+        ground_row = generate_chunk(seed, chunk_col)[(CHUNK_TILES - 1) * CHUNK_TILES:]
+        for tile in ground_row:
+            run = 0 if tile == TILE_SOLID else run + 1
+            widest = max(widest, run)
+    return widest
+
+
+def test_gaps_stay_within_jump_range():
+    # Distance covered by a full jump landing back at take-off height, less the
+    # player's own width, which has to clear the far edge
+    jump_range = 2 * -JUMP_VELOCITY / GRAVITY * PLAYER_SPEED - PLAYER_WIDTH
+    assert MAX_PIT_WIDTH * TILE_SIZE < jump_range
+
+    for seed in range(20):
+        assert widest_gap(seed, 200) <= MAX_PIT_WIDTH, f"seed {seed}"